@@ -0,0 +1,48 @@
+"""HDF5 reading helpers of mmu.utils."""
+from typing import List
+
+import h5py
+import numpy as np
+
+# HDF5 keeps at most 1 MiB of decompressed chunks per dataset by default. A chunk that
+# does not fit is decompressed again for every partial selection that touches it: row
+# slices, or the strips a read with type conversion goes through. A larger cache keeps
+# each chunk decompressed while all of these selections are read.
+CHUNK_CACHE_BYTES = 64 * 1024 * 1024
+# HDF5 recommends about 100 hash table slots per chunk that fits in the cache
+CHUNK_CACHE_SLOTS_PER_CHUNK = 100
+
+
+def open_dataset(h5_file: h5py.File, name: str) -> h5py.Dataset:
+    """Open a dataset with a CHUNK_CACHE_BYTES chunk cache, its hash table sized to the
+    number of its chunks that can be cached at once."""
+    dataset = h5_file[name]
+    if dataset.chunks is None:
+        return dataset
+    chunk_bytes = int(np.prod(dataset.chunks)) * dataset.dtype.itemsize
+    num_chunks = int(np.prod(np.ceil(np.divide(dataset.shape, dataset.chunks))))
+    # HDF5 shares the chunk cache of a dataset that is already open, close it first
+    del dataset
+    cached_chunks = max(1, min(num_chunks, CHUNK_CACHE_BYTES // chunk_bytes))
+    dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+    dapl.set_chunk_cache(
+        CHUNK_CACHE_SLOTS_PER_CHUNK * cached_chunks, CHUNK_CACHE_BYTES, 0.75
+    )
+    return h5py.Dataset(h5py.h5d.open(h5_file.id, name.encode(), dapl))
+
+
+def read_catalog_columns(filename: str, keys: List[str]) -> dict:
+    """Read whole catalog columns of an HDF5 file as 1D NumPy arrays.
+
+    Bytes columns are converted to unicode for astropy compatibility.
+    """
+    with h5py.File(filename, "r") as data:
+        table_data = {}
+        for k in keys:
+            value = open_dataset(data, k)[()]
+            if hasattr(value, "dtype") and value.dtype.kind == "S":
+                # Wrap scalar in array and convert bytes to unicode
+                table_data[k] = np.atleast_1d(value).astype("U")
+            else:
+                table_data[k] = np.atleast_1d(value)
+        return table_data
@@ -1,29 +1,28 @@
 import os
+import re
 from datasets import DatasetBuilder, Dataset
-from astropy.table import Table, hstack, vstack
+from astropy.table import Table, hstack
 from astropy.coordinates import SkyCoord
 from astropy import units as u
 from typing import List
 from functools import partial
 from multiprocessing import Pool
+from mmu.hdf5 import read_catalog_columns
 import numpy as np
-import h5py
 import pandas as pd
 from astropy import units
 
+_HEALPIX_PATTERN = re.compile(r"healpix=(\d+)")
 
-def _file_to_catalog(filename: str, keys: List[str]):
-    with h5py.File(filename, "r") as data:
-        table_data = {}
-        for k in keys:
-            value = data[k][()]  # Get the value
-            # Convert bytes dtype to unicode for astropy compatibility
-            if hasattr(value, "dtype") and value.dtype.kind == "S":
-                # Wrap scalar in array and convert bytes to unicode
-                table_data[k] = np.atleast_1d(value).astype("U")
-            else:
-                table_data[k] = np.atleast_1d(value)
-        return Table(table_data)
+
+def _files_by_healpix(files: List[str]) -> dict:
+    """Map each healpix index to the first of the given files that belongs to it."""
+    files_by_healpix = {}
+    for filename in files:
+        match = _HEALPIX_PATTERN.search(filename)
+        if match is not None:
+            files_by_healpix.setdefault(int(match.group(1)), filename)
+    return files_by_healpix
 
 
 def get_catalog(
@@ -50,16 +49,18 @@ def get_catalog(
         raise ValueError(
             f"At least one data file must be specified, but got data_files={dset.config.data_files}"
         )
+    filenames = dset.config.data_files[split]
+    if not filenames:
+        return Table(names=keys)
     catalogs = []
     if num_proc > 1:
-        with Pool(num_proc) as pool:
-            catalogs = pool.map(
-                partial(_file_to_catalog, keys=keys), dset.config.data_files[split]
-            )
+        with Pool(min(num_proc, len(filenames))) as pool:
+            catalogs = pool.map(partial(read_catalog_columns, keys=keys), filenames)
     else:
-        for filename in dset.config.data_files[split]:
-            catalogs.append(_file_to_catalog(filename, keys=keys))
-    return vstack(catalogs)
+        for filename in filenames:
+            catalogs.append(read_catalog_columns(filename, keys=keys))
+    # one concatenation per column, instead of a Table per file and a vstack of them
+    return Table({k: np.concatenate([catalog[k] for catalog in catalogs]) for k in keys})
 
 
 def cross_match_datasets(
@@ -81,6 +82,7 @@ def cross_match_datasets(
         keep_in_memory (bool, optional): If True, the cross-matched dataset will be kept in memory. Defaults to False.
         matching_radius (float, optional): The maximum separation in arcseconds for a match to be considered. Defaults to 1.
         return_catalog_only (bool, optional): If True, only the cross-matched catalog will be returned. Defaults to False.
+        num_proc (int, optional): Number of processes used to read the catalogs and to generate the new dataset. Defaults to None.
 
     Returns:
         tuple: A tuple containing the cross-matched catalog and the new dataset.
@@ -93,34 +95,49 @@ def cross_match_datasets(
         right_dataset = ...
         matched_catalog, new_dataset = cross_match_datasets(left_dataset, right_dataset)
     """
-    # Access the catalogs for both datasets
-    cat_left = get_catalog(left)
-    cat_left["sc"] = SkyCoord(cat_left["ra"], cat_left["dec"], unit="deg")
-
-    cat_right = get_catalog(right)
-    cat_right["sc"] = SkyCoord(cat_right["ra"], cat_right["dec"], unit="deg")
-
-    # Cross match the catalogs and restricting them to matches
-    idx, sep2d, _ = cat_left["sc"].match_to_catalog_sky(cat_right["sc"])
-    mask = sep2d < matching_radius * u.arcsec
-    cat_left = cat_left[mask]
-    cat_right = cat_right[idx[mask]]
+    # Access the catalogs for both datasets, reading the files in parallel when requested
+    cat_left = get_catalog(left, num_proc=num_proc or 1)
+    cat_right = get_catalog(right, num_proc=num_proc or 1)
+
+    if len(cat_left) == 0 or len(cat_right) == 0:
+        # Nothing can match, and astropy refuses to match against an empty catalog
+        left_idx = right_idx = np.array([], dtype=int)
+    else:
+        # Build the coordinates from plain float64 arrays rather than storing them as a
+        # SkyCoord mixin column, which would be copied along with every table selection
+        left_coords = SkyCoord(
+            np.asarray(cat_left["ra"], dtype=np.float64),
+            np.asarray(cat_left["dec"], dtype=np.float64),
+            unit="deg",
+        )
+        right_coords = SkyCoord(
+            np.asarray(cat_right["ra"], dtype=np.float64),
+            np.asarray(cat_right["dec"], dtype=np.float64),
+            unit="deg",
+        )
+
+        # Cross match the catalogs and restricting them to matches
+        idx, sep2d, _ = left_coords.match_to_catalog_sky(right_coords)
+        left_idx = np.flatnonzero(sep2d < matching_radius * u.arcsec)
+        right_idx = idx[left_idx]
+    print("Initial number of matches: ", len(left_idx))
+    # Remove objects that were matched between the two catalogs but fall under different healpix indices.
+    # This is done on the index arrays, so that rejected matches are never copied into the merged table.
+    same_healpix = (
+        np.asarray(cat_left["healpix"])[left_idx]
+        == np.asarray(cat_right["healpix"])[right_idx]
+    )
+    cat_left = cat_left[left_idx[same_healpix]]
+    cat_right = cat_right[right_idx[same_healpix]]
     assert len(cat_left) == len(cat_right), "There was an error in the cross-matching."
-    print("Initial number of matches: ", len(cat_left))
     matched_catalog = hstack(
         [cat_left, cat_right],
         table_names=[left.config.name, right.config.name],
         uniq_col_name="{table_name}_{col_name}",
     )
-    # Remove objects that were matched between the two catalogs but fall under different healpix indices
-    mask = (
-        matched_catalog[f"{left.config.name}_healpix"]
-        == matched_catalog[f"{right.config.name}_healpix"]
-    )
-    matched_catalog = matched_catalog[mask]
     print(
         "Number of matches lost at healpix region borders: ",
-        len(cat_left) - len(matched_catalog),
+        len(left_idx) - len(matched_catalog),
     )
     print("Final size of cross-matched catalog: ", len(matched_catalog))
 
@@ -146,50 +163,38 @@ def cross_match_datasets(
     if return_catalog_only:
         return matched_catalog
 
-    # Retrieve the list of files of both datasets
-    files_left = left.config.data_files["train"]
-    files_right = right.config.data_files["train"]
+    # Retrieve the files of both datasets, indexed by healpix once rather than scanned per group
+    files_left = _files_by_healpix(left.config.data_files["train"])
+    files_right = _files_by_healpix(right.config.data_files["train"])
     catalog_groups = [group for group in matched_catalog.groups]
 
     # Create a generator function that merges the two generators
     def _generate_examples(groups):
         for group in groups:
             healpix = group["healpix"][0]
+            # Pull the matched ids out as arrays once per healpix group, instead of
+            # indexing the group's id columns for every match in the loop below
+            left_ids = np.asarray(group[left.config.name + "_object_id"])
+            right_ids = np.asarray(group[right.config.name + "_object_id"])
             generators = [
                 # Build generators that only reads the files corresponding to the current healpix index
                 left._generate_examples(
-                    files=[
-                        files_left[
-                            [
-                                i
-                                for i in range(len(files_left))
-                                if f"healpix={healpix}" in files_left[i]
-                            ][0]
-                        ]
-                    ],
-                    object_ids=[group[left.config.name + "_object_id"]],
+                    files=[files_left[int(healpix)]],
+                    object_ids=[left_ids],
                 ),
                 right._generate_examples(
-                    files=[
-                        files_right[
-                            [
-                                i
-                                for i in range(len(files_right))
-                                if f"healpix={healpix}" in files_right[i]
-                            ][0]
-                        ]
-                    ],
-                    object_ids=[group[right.config.name + "_object_id"]],
+                    files=[files_right[int(healpix)]],
+                    object_ids=[right_ids],
                 ),
             ]
             # Retrieve the generators for both datasets
             for i, examples in enumerate(zip(*generators)):
                 left_id, example_left = examples[0]
                 right_id, example_right = examples[1]
-                assert str(group[i][left.config.name + "_object_id"]) in left_id, (
+                assert str(left_ids[i]) in left_id, (
                     "There was an error in the cross-matching generation."
                 )
-                assert str(group[i][right.config.name + "_object_id"]) in right_id, (
+                assert str(right_ids[i]) in right_id, (
                     "There was an error in the cross-matching generation."
                 )
                 example_left.update(example_right)
@@ -219,10 +224,10 @@ def cross_match_datasets(
 
 def extract_cat_params(cat: DatasetBuilder):
     """This just grabs the ra, dec, and healpix columns from a catalogue."""
-    cat = get_catalog(cat)
-    subcat = pd.DataFrame(
-        data=dict((col, cat[col].data) for col in ["ra", "dec", "healpix"])
-    )
+    keys = ["ra", "dec", "healpix"]
+    # Only read the columns we need, each file is then touched once per column
+    cat = get_catalog(cat, keys=keys)
+    subcat = pd.DataFrame(data=dict((col, cat[col].data) for col in keys))
     return subcat
 
 
@@ -270,17 +275,27 @@ def build_master_catalog(
         # Extract the relevant columns
         cat = extract_cat_params(cat)
 
-        # Match the catalogues
+        # Match the catalogues. The master columns are object dtype until the final
+        # conversion below, so hand SkyCoord float64 arrays instead of the Series.
+        # Both coordinate sets are built once and reused for the matches in both directions.
         master_coords = SkyCoord(
-            master_cat.loc[:, "ra"], master_cat.loc[:, "dec"], unit="deg"
+            master_cat["ra"].to_numpy(dtype=np.float64),
+            master_cat["dec"].to_numpy(dtype=np.float64),
+            unit="deg",
+        )
+        cat_coords = SkyCoord(
+            cat["ra"].to_numpy(dtype=np.float64),
+            cat["dec"].to_numpy(dtype=np.float64),
+            unit="deg",
         )
-        cat_coords = SkyCoord(cat.loc[:, "ra"], cat.loc[:, "dec"], unit="deg")
-        idx, sep2d, _ = master_coords.match_to_catalog_sky(cat_coords)
-        mask = sep2d < matching_radius * units.arcsec
+        if len(master_cat) > 0 and len(cat) > 0:
+            # Empty catalogues cannot match anything, and astropy refuses to match against them
+            idx, sep2d, _ = master_coords.match_to_catalog_sky(cat_coords)
+            mask = sep2d < matching_radius * units.arcsec
 
-        # Update the matching columns
-        master_cat.loc[mask, name] = True
-        master_cat.loc[mask, name + "_idx"] = idx[mask]
+            # Update the matching columns
+            master_cat.loc[mask, name] = True
+            master_cat.loc[mask, name + "_idx"] = idx[mask]
 
         # Add new rows to the master catalogue
         if len(master_cat) == 0:
@@ -0,0 +1,16 @@
+import pytest
+
+from main import MMUReader
+from catalog_functions.csp_transformer import CSPTransformer
+from catalog_functions.cfa_transformer import CFATransformer
+
+
+# Readers hold no per-file state, so one instance per transformer serves all tests
+@pytest.fixture(scope="session")
+def cfa_reader():
+    return MMUReader(chunk_mb=128, transform_klass=CFATransformer)
+
+
+@pytest.fixture(scope="session")
+def csp_reader():
+    return MMUReader(chunk_mb=128, transform_klass=CSPTransformer)
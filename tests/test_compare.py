@@ -1,6 +1,20 @@
-from verification.compare import compare_tables
+from verification.compare import compare_tables, load_table
 import pyarrow as pa
 import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+# Coordinate columns shared by the three-row tables below, Arrow arrays are immutable
+_RA = pa.array([10.0, 20.0, 30.0], type=pa.float64())
+_DEC = pa.array([-10.0, -20.0, -30.0], type=pa.float64())
+# Type of the lightcurve test columns, declared so pyarrow does not infer it from the dicts
+_LC_TYPE = pa.struct(
+    [
+        ("time", pa.list_(pa.float64())),
+        ("flux", pa.list_(pa.float64())),
+        ("flux_err", pa.list_(pa.float64())),
+    ]
+)
 
 
 def test_compare_list_struct_field_with_exemptions():
@@ -79,15 +93,15 @@ def test_compare_basic():
     table1 = pa.table(
         {
             "a": pa.array([1, 2, 3]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     table2 = pa.table(
         {
             "a": pa.array([1, 2, 4]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
@@ -100,15 +114,15 @@ def test_compare_basic_float32():
     table1 = pa.table(
         {
             "a": pa.array([1, 2, 3]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]).cast(pa.float32()),
+            "ra": _RA,
+            "dec": pa.array([-10.0, -20.0, -30.0], type=pa.float32()),
         }
     )
     table2 = pa.table(
         {
             "a": pa.array([1, 2, 4]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]).cast(pa.float32()),
+            "ra": _RA,
+            "dec": pa.array([-10.0, -20.0, -30.0], type=pa.float32()),
         }
     )
     issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
@@ -127,16 +141,16 @@ def test_compare_multiple_columns():
         {
             "a": pa.array([1, 2, 3]),
             "b": pa.array([4, 5, 6]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     table2 = pa.table(
         {
             "a": pa.array([1, 2, 4]),
             "b": pa.array([4, 5, 6]),
-            "ra": pa.array([10.0, 20.0, 30.0]).cast(pa.float64()),
-            "dec": pa.array([-10.0, -20.0, -30.0]).cast(pa.float64()),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
@@ -148,16 +162,16 @@ def test_compare_multiple_columns_nans():
         {
             "a": pa.array([1, 2, 3]),
             "b": pa.array([4, 5, np.nan]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     table2 = pa.table(
         {
             "a": pa.array([1, 2, 3]),
             "b": pa.array([4, 5, np.nan]),
-            "ra": pa.array([10.0, 20.0, 30.0]).cast(pa.float64()),
-            "dec": pa.array([-10.0, -20.0, -30.0]).cast(pa.float64()),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
@@ -169,16 +183,16 @@ def test_compare_multiple_columns_floating():
         {
             "a": pa.array([1.0, 2.0, 3.0]),
             "b": pa.array([4.0, 5.0, 6.0]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     table2 = pa.table(
         {
             "a": pa.array([1.0, 2.0, 4.0]),
             "b": pa.array([4.0, 5.0, 6.0]),
-            "ra": pa.array([10.0, 20.0, 30.0]).cast(pa.float64()),
-            "dec": pa.array([-10.0, -20.0, -30.0]).cast(pa.float64()),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
@@ -192,7 +206,8 @@ def test_compare_no_sort_column():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 20.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
             # "ra": pa.array([10.0, 20.0]),
             # "dec": pa.array([-10.0, -20.0]),
@@ -204,7 +219,8 @@ def test_compare_no_sort_column():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 25.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
             # "ra": pa.array([10.0, 20.0]).cast(pa.float64()),
             # "dec": pa.array([-10.0, -20.0]).cast(pa.float64()),
@@ -228,6 +244,61 @@ def test_preferred_sort_column():
     )  # 1 issue for object_id mismatch + 2 issues for missing ra, dec for table2
 
 
+def test_compare_shuffled_unique_ids():
+    table1 = pa.table(
+        {
+            "object_id": pa.array(["3", "1", "2"]),
+            "b": pa.array([6.0, 4.0, 5.0]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    table2 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "b": pa.array([4.0, 5.5, 6.0]),
+            "ra": pa.array([20.0, 30.0, 10.0]),
+            "dec": pa.array([-20.0, -30.0, -10.0]),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    assert len(issues) == 1
+    # rows are paired on object_id, samples are indexed by the row of the first table
+    assert issues[0]["samples"] == [{"index": 2, "left": 5.0, "right": 5.5}]
+
+
+def test_compare_key_type_mismatch():
+    table1 = pa.table({"object_id": pa.array([3, 1, 2]), "ra": _RA, "dec": _DEC})
+    table2 = pa.table(
+        {"object_id": pa.array(["c", "a", "b"]), "ra": _RA, "dec": _DEC}
+    )
+    # int64 and string keys cannot be paired by hash lookup, the tables are sorted instead
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    assert [issue["column"] for issue in issues] == ["object_id"]
+
+
+def test_compare_leading_zero_ids_not_merged():
+    # duplicated ids force a sort, "007" and "7" must stay distinct keys
+    table1 = pa.table(
+        {
+            "object_id": pa.array(["7", "007", "7"]),
+            "b": pa.array([1.0, 2.0, 1.0]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    table2 = pa.table(
+        {
+            "object_id": pa.array(["007", "7", "7"]),
+            "b": pa.array([2.0, 1.0, 1.0]),
+            "ra": pa.array([20.0, 10.0, 30.0]),
+            "dec": pa.array([-20.0, -10.0, -30.0]),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    assert issues == []
+
+
 def test_col_only_in_one_table():
     table1 = pa.table({"a": pa.array([1, 2, 3]), "b": pa.array([4, 5, 6])})
     table2 = pa.table({"a": pa.array([1, 2, 3]), "c": pa.array([7, 8, 9])})
@@ -271,8 +342,8 @@ def test_compare_unequal_rows():
     table1 = pa.table(
         {
             "a": pa.array([1, 2, 3]),
-            "ra": pa.array([10.0, 20.0, 30.0]),
-            "dec": pa.array([-10.0, -20.0, -30.0]),
+            "ra": _RA,
+            "dec": _DEC,
         }
     )
     table2 = pa.table(
@@ -302,7 +373,8 @@ def test_compare_nested_mismatch():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 20.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
         }
     )
@@ -313,7 +385,8 @@ def test_compare_nested_mismatch():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 25.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
         }
     )
@@ -321,6 +394,86 @@ def test_compare_nested_mismatch():
     assert len(issues) == 3  # 4 issues for missing ra, dec and 1 for flux mismatch
 
 
+def test_compare_list_mismatch_past_first_rows():
+    table1 = pa.table(
+        {
+            "index": pa.array(range(8)),
+            "flux": pa.array([[float(i), float(i)] for i in range(8)]),
+        }
+    )
+    table2 = pa.table(
+        {
+            "index": pa.array(range(8)),
+            "flux": pa.array([[float(i), float(i) + (i == 6)] for i in range(8)]),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    flux_issues = [issue for issue in issues if issue["column"] == "flux"]
+    assert len(flux_issues) == 1
+    assert flux_issues[0]["samples"] == [
+        {"index": 6, "left": [6.0, 6.0], "right": [6.0, 7.0]}
+    ]
+
+
+def test_compare_list_of_lists_mismatch():
+    table1 = pa.table(
+        {
+            "index": pa.array(range(4)),
+            "spectra": pa.array([[[float(i)], [np.nan, 1.0]] for i in range(4)]),
+        }
+    )
+    table2 = pa.table(
+        {
+            "index": pa.array(range(4)),
+            "spectra": pa.array(
+                [[[float(i) + (i == 2)], [np.nan, 1.0]] for i in range(4)]
+            ),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    spectra_issues = [issue for issue in issues if issue["column"] == "spectra"]
+    assert len(spectra_issues) == 1
+    assert [sample["index"] for sample in spectra_issues[0]["samples"]] == [2]
+
+
+def test_compare_list_length_mismatch():
+    table1 = pa.table(
+        {
+            "index": pa.array(range(3)),
+            "flux": pa.array([[1.0], [2.0], [3.0]]),
+        }
+    )
+    table2 = pa.table(
+        {
+            "index": pa.array(range(3)),
+            "flux": pa.array([[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    flux_issues = [issue for issue in issues if issue["column"] == "flux"]
+    assert len(flux_issues) == 1
+    assert flux_issues[0]["samples"] == [
+        {"index": 0, "left": [1.0], "right": [1.0, 1.0]},
+        {"index": 1, "left": [2.0], "right": [2.0, 2.0]},
+        {"index": 2, "left": [3.0], "right": [3.0, 3.0]},
+    ]
+
+
+def test_compare_list_struct_extra_point():
+    lc_type = pa.list_(pa.struct([("t", pa.float64()), ("band", pa.string())]))
+    lc1 = [[{"t": 1.0, "band": "g"}], [{"t": 2.0, "band": "r"}]]
+    lc2 = [[{"t": 1.0, "band": "g"}], [{"t": 2.0, "band": "r"}, {"t": 3.0, "band": "i"}]]
+    table1 = pa.table({"index": pa.array([0, 1]), "lc": pa.array(lc1, type=lc_type)})
+    table2 = pa.table({"index": pa.array([0, 1]), "lc": pa.array(lc2, type=lc_type)})
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    lc_issues = {issue["column"]: issue for issue in issues if issue["type"] == "column_values"}
+    assert sorted(lc_issues) == ["lc.band", "lc.t"]
+    assert lc_issues["lc.t"]["samples"] == [{"index": 1, "left": [2.0], "right": [2.0, 3.0]}]
+    assert lc_issues["lc.band"]["samples"] == [
+        {"index": 1, "left": ["r"], "right": ["r", "i"]}
+    ]
+
+
 def test_compare_nested_passing():
     table1 = pa.table(
         {
@@ -329,7 +482,8 @@ def test_compare_nested_passing():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 25.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
             "ra": pa.array([10.0, 20.0]),
             "dec": pa.array([-10.0, -20.0]),
@@ -342,7 +496,8 @@ def test_compare_nested_passing():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 25.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
             "ra": pa.array([10.0, 20.0]),
             "dec": pa.array([-10.0, -20.0]),
@@ -360,7 +515,8 @@ def test_compare_nested_vs_unnested():
                 [
                     {"time": [1.0, 2.0], "flux": [10.0, 25.0], "flux_err": [0.1, 0.2]},
                     {"time": [3.0, 4.0], "flux": [30.0, 40.0], "flux_err": [0.3, 0.4]},
-                ]
+                ],
+                type=_LC_TYPE,
             ),
         }
     )
@@ -408,3 +564,207 @@ def test_compare_nested_vs_unnested():
         "message": "Table 2 has additional columns: ['flux', 'flux_err', 'time']",
         "table": "Table 2",
     }
+
+
+def test_compare_nulls_equal_on_both_sides():
+    table1 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "label": pa.array(["x", None, "z"]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    table2 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "label": pa.array(["x", None, None]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    assert len(issues) == 1
+    assert issues[0]["column"] == "label"
+    assert issues[0]["samples"] == [{"index": 2, "left": "z", "right": None}]
+
+
+def test_compare_float_null_matches_nan():
+    # nulls are compared as NaN, as with to_numpy(), but not as a number
+    table1 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "flux": pa.array([None, None, None], type=pa.float64()),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    table2 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "flux": pa.array([np.nan, None, 1.0]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    assert len(issues) == 1
+    assert issues[0]["samples"] == [{"index": 2, "left": None, "right": 1.0}]
+
+
+def test_compare_struct_field_named_like_column():
+    # lightcurve.flux must be compared even though a top-level flux column exists
+    table1 = pa.table(
+        {
+            "index": pa.array([0, 1]),
+            "flux": pa.array([1.0, 2.0]),
+            "lightcurve": pa.array([{"flux": 10.0}, {"flux": 20.0}]),
+        }
+    )
+    table2 = pa.table(
+        {
+            "index": pa.array([0, 1]),
+            "flux": pa.array([1.0, 2.0]),
+            "lightcurve": pa.array([{"flux": 10.0}, {"flux": 25.0}]),
+        }
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    value_issues = [issue for issue in issues if issue["type"] == "column_values"]
+    assert [issue["column"] for issue in value_issues] == ["lightcurve.flux"]
+
+
+def test_compare_selected_columns_only():
+    table1 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "flux": pa.array([1.0, 2.0, 3.0]),
+            "band": pa.array(["g", "r", "i"]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    table2 = pa.table(
+        {
+            "object_id": pa.array(["1", "2", "3"]),
+            "flux": pa.array([1.0, 2.5, 3.0]),
+            "band": pa.array(["g", "r", "z"]),
+            "only_in_table2": pa.array([0, 0, 0]),
+            "ra": _RA,
+            "dec": _DEC,
+        }
+    )
+    issues = compare_tables(
+        table1,
+        table2,
+        label1="Table 1",
+        label2="Table 2",
+        columns=["object_id", "flux", "ra", "dec"],
+    )
+    # band and only_in_table2 differ but are neither compared nor reported
+    assert [issue["column"] for issue in issues] == ["flux"]
+    assert issues[0]["samples"] == [{"index": 1, "left": 2.0, "right": 2.5}]
+
+
+def test_compare_missing_selected_column_reported():
+    table1 = pa.table({"object_id": pa.array(["1", "2"]), "lc": pa.array([1.0, 2.0])})
+    table2 = pa.table({"object_id": pa.array(["1", "2"]), "lc": pa.array([1.0, 2.0])})
+    issues = compare_tables(
+        table1, table2, label1="Table 1", label2="Table 2", columns=["LC", "flux"]
+    )
+    # LC matches lc like in load_table, flux is in neither table
+    assert [issue["message"] for issue in issues if issue["type"] == "columns"] == [
+        "Table 1 is missing requested columns: ['flux']",
+        "Table 2 is missing requested columns: ['flux']",
+    ]
+    assert all(issue["column"] is None for issue in issues)
+
+
+def test_compare_selected_columns_case_insensitive():
+    table1 = pa.table({"object_id": pa.array(["1", "2"]), "Flux": pa.array([1.0, 2.0])})
+    table2 = pa.table({"object_id": pa.array(["1", "2"]), "Flux": pa.array([1.0, 2.5])})
+    issues = compare_tables(
+        table1, table2, label1="Table 1", label2="Table 2", columns=["object_id", "flux"]
+    )
+    assert [issue["column"] for issue in issues] == ["Flux"]
+
+
+def test_compare_sample_index_is_first_table_row():
+    # duplicated keys, so the rows are paired by sorting both tables
+    table1 = pa.table(
+        {"object_id": pa.array([2, 1, 1]), "flux": pa.array([20.0, 10.0, 11.0])}
+    )
+    table2 = pa.table(
+        {"object_id": pa.array([1, 1, 2]), "flux": pa.array([10.0, 11.0, 25.0])}
+    )
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    flux_issues = [issue for issue in issues if issue["column"] == "flux"]
+    assert flux_issues[0]["samples"] == [{"index": 0, "left": 20.0, "right": 25.0}]
+
+
+def test_compare_list_struct_sample_index_is_row():
+    lc_type = pa.list_(pa.struct([("t", pa.float64())]))
+    lc1 = [[{"t": 1.0}, {"t": 2.0}], [{"t": 3.0}, {"t": 4.0}]]
+    lc2 = [[{"t": 1.0}, {"t": 2.0}], [{"t": 3.0}, {"t": 5.0}]]
+    table1 = pa.table({"index": pa.array([0, 1]), "lc": pa.array(lc1, type=lc_type)})
+    table2 = pa.table({"index": pa.array([0, 1]), "lc": pa.array(lc2, type=lc_type)})
+    issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    lc_issues = [issue for issue in issues if issue["column"] == "lc.t"]
+    assert lc_issues[0]["samples"] == [{"index": 1, "left": 4.0, "right": 5.0}]
+
+
+def test_load_table_saved_dataset(tmp_path):
+    datasets = pytest.importorskip("datasets")
+    data = {
+        "object_id": ["a", "b", "c", "d"],
+        "RA": [1.0, 2.0, 3.0, 4.0],
+        "flux": [[1.0], [], [2.0, 3.0], [4.0]],
+    }
+    # several shards, so the table is read from several Arrow stream files in state.json
+    datasets.Dataset.from_dict(data).save_to_disk(tmp_path / "saved", num_shards=2)
+    assert len(list((tmp_path / "saved").glob("*.arrow"))) == 2
+
+    table = load_table(tmp_path / "saved")
+    assert table.to_pydict() == data
+    # columns are matched case-insensitively, like compare_tables does
+    assert load_table(tmp_path / "saved", columns=["object_id", "ra"]).column_names == [
+        "object_id",
+        "RA",
+    ]
+
+
+def test_load_table_empty_saved_dataset(tmp_path):
+    datasets = pytest.importorskip("datasets")
+    features = datasets.Features(
+        {"object_id": datasets.Value("string"), "ra": datasets.Value("float64")}
+    )
+    datasets.Dataset.from_dict({"object_id": [], "ra": []}, features=features).save_to_disk(
+        tmp_path / "empty"
+    )
+    table = load_table(tmp_path / "empty")
+    assert table.num_rows == 0
+    assert table.schema == pa.schema([("object_id", pa.string()), ("ra", pa.float64())])
+
+
+def test_load_table_parquet_columns(tmp_path):
+    table = pa.table({"object_id": ["a", "b"], "RA": [1.0, 2.0], "flux": [3.0, 4.0]})
+    pq.write_table(table, tmp_path / "table.parquet")
+    assert load_table(tmp_path / "table.parquet").equals(table)
+    assert load_table(tmp_path / "table.parquet", columns=["ra"]).column_names == ["RA"]
+
+
+def test_compare_list_of_canonical_extension_values():
+    # fixed_shape_tensor is a canonical extension type, not a pa.ExtensionType subclass
+    tensor_type = pa.fixed_shape_tensor(pa.float32(), [2])
+    storage = pa.array([[1, 2], [3, 4], [5, 6]], pa.list_(pa.float32(), 2))
+    images1 = pa.ListArray.from_arrays(
+        [0, 1, 3], pa.ExtensionArray.from_storage(tensor_type, storage)
+    )
+    images2 = pa.ListArray.from_arrays(
+        [0, 1, 3], pa.array([[1, 2], [3, 4], [5, 7]], pa.list_(pa.float32(), 2))
+    )
+    table1 = pa.table({"index": pa.array([0, 1]), "image": images1})
+    table2 = pa.table({"index": pa.array([0, 1]), "image": images2})
+    with pytest.warns(UserWarning, match="Extension type mismatch for column 'image'"):
+        issues = compare_tables(table1, table2, label1="Table 1", label2="Table 2")
+    image_issues = [issue for issue in issues if issue["column"] == "image"]
+    assert [sample["index"] for sample in image_issues[0]["samples"]] == [1]
@@ -1,15 +1,13 @@
-from main import MMUReader
-from catalog_functions.csp_transformer import CSPTransformer
-from catalog_functions.cfa_transformer import CFATransformer
+import pytest
 
 
-def test_mmu_reader_cfa():
-    mmu = MMUReader(chunk_mb=128, transform_klass=CFATransformer)
-    tables = [t for t in mmu.read("tests/data/cfa/SN2007bc.hdf5")]
+def test_mmu_reader_cfa(cfa_reader):
+    chunks = cfa_reader.read("tests/data/cfa/SN2007bc.hdf5")
 
     # Single-object file should produce exactly one table chunk
-    assert len(tables) == 1
-    table = tables[0]
+    table = next(chunks)
+    with pytest.raises(StopIteration):
+        next(chunks)
 
     # Should have exactly 1 row (one supernova per file)
     assert table.num_rows == 1
@@ -21,13 +19,13 @@ def test_mmu_reader_cfa():
     assert table.column("object_id")[0].as_py() == "SN2007bc"
 
 
-def test_mmu_reader_csp():
-    mmu = MMUReader(chunk_mb=128, transform_klass=CSPTransformer)
-    tables = [t for t in mmu.read("tests/data/csp/example_SN2004dt.hdf5")]
+def test_mmu_reader_csp(csp_reader):
+    chunks = csp_reader.read("tests/data/csp/example_SN2004dt.hdf5")
 
     # Single-object file should produce exactly one table chunk
-    assert len(tables) == 1
-    table = tables[0]
+    table = next(chunks)
+    with pytest.raises(StopIteration):
+        next(chunks)
 
     # Should have exactly 1 row (one supernova per file)
     assert table.num_rows == 1
@@ -68,13 +66,13 @@ def test_mmu_reader_csp():
     assert lc["band"][46] == "H"
 
 
-def test_mmu_reader_ra_dec_only():
+def test_mmu_reader_ra_dec_only(csp_reader):
     """When read_columns=['ra', 'dec'], should return a simple table with coordinates."""
-    mmu = MMUReader(chunk_mb=128, transform_klass=CSPTransformer)
-    tables = [t for t in mmu.read("tests/data/csp/example_SN2004dt.hdf5", read_columns=["ra", "dec"])]
+    chunks = csp_reader.read("tests/data/csp/example_SN2004dt.hdf5", read_columns=["ra", "dec"])
 
-    assert len(tables) == 1
-    table = tables[0]
+    table = next(chunks)
+    with pytest.raises(StopIteration):
+        next(chunks)
 
     assert table.num_rows == 1
     assert set(table.column_names) == {"ra", "dec"}
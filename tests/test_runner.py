@@ -0,0 +1,35 @@
+import pyarrow.parquet as pq
+import pytest
+
+from catalog_functions.cfa_transformer import CFATransformer
+from catalog_functions.csp_transformer import CSPTransformer
+from transform_scripts.runner import WORKERS_ENV_VAR, run
+
+CSP_FILE = "tests/data/csp/example_SN2004dt.hdf5"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_round_trip(tmp_path, workers):
+    output_file = tmp_path / "csp.parquet"
+    # the same file twice, so that two worker processes each transform one
+    schema = run(CSPTransformer, [CSP_FILE, CSP_FILE], output_file, workers=workers)
+
+    expected = CSPTransformer().transform_from_hdf5_file(CSP_FILE)
+    table = pq.read_table(output_file)
+    assert table.schema.equals(schema)
+    assert table.schema.equals(expected.schema)
+    assert table.num_rows == 2
+    assert table.slice(0, 1).equals(expected)
+    assert table.slice(1, 1).equals(expected)
+
+
+def test_run_directory_in_input_order(tmp_path, monkeypatch):
+    monkeypatch.setenv(WORKERS_ENV_VAR, "2")
+    output_file = tmp_path / "cfa.parquet"
+    run(CFATransformer, "tests/data/cfa", output_file)
+    assert pq.read_table(output_file).column("object_id").to_pylist() == ["SN2007bc"]
+
+
+def test_run_without_files(tmp_path):
+    with pytest.raises(ValueError, match="No HDF5 files found"):
+        run(CSPTransformer, str(tmp_path), tmp_path / "empty.parquet")
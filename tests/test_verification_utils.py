@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("astropy")
+h5py = pytest.importorskip("h5py")
+datasets = pytest.importorskip("datasets")
+
+from astropy.table import Table
+
+from verification.utils import add_catalog_columns, get_catalog, index_catalog
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_utils_imports_standalone():
+    # verify.py runs the process scripts as `python verification/<script>.py` from the
+    # repository root, without the mmu package installed: sys.path[0] is verification/
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    result = subprocess.run(
+        [sys.executable, "verification/utils.py"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def _write_catalog_file(path, object_ids, ra):
+    with h5py.File(path, "w") as data:
+        data.create_dataset("object_id", data=np.array(object_ids, dtype="S"), chunks=(1,))
+        data.create_dataset("ra", data=np.array(ra, dtype=np.float64), chunks=(1,))
+    return str(path)
+
+
+@pytest.mark.parametrize("num_proc", [1, 2])
+def test_get_catalog_concatenates_files(tmp_path, num_proc):
+    files = [
+        _write_catalog_file(tmp_path / "a.hdf5", ["a1", "a2"], [1.0, 2.0]),
+        _write_catalog_file(tmp_path / "b.hdf5", ["b1"], [3.0]),
+    ]
+    dset = SimpleNamespace(config=SimpleNamespace(data_files={"train": files}))
+    catalog = get_catalog(dset, keys=["object_id", "ra"], num_proc=num_proc)
+    assert catalog["object_id"].tolist() == ["a1", "a2", "b1"]
+    assert catalog["ra"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_get_catalog_without_files():
+    dset = SimpleNamespace(config=SimpleNamespace(data_files={"train": []}))
+    catalog = get_catalog(dset, keys=["object_id", "ra"])
+    assert len(catalog) == 0
+    assert catalog.colnames == ["object_id", "ra"]
+
+
+def test_index_catalog_duplicates():
+    catalog = Table({"object_id": [3, 1, 3, 2]})
+    row_of_object_id, duplicated = index_catalog(catalog)
+    # a duplicated id maps to its first row
+    assert row_of_object_id == {3: 0, 1: 1, 2: 3}
+    assert duplicated == {3}
+
+
+def _dataset(object_ids):
+    return datasets.Dataset.from_dict(
+        {"object_id": object_ids, "flux": [float(i) for i in range(len(object_ids))]}
+    )
+
+
+def _catalog():
+    return Table(
+        {
+            "object_id": ["a", "b", "c"],
+            "ra": np.array([1.0, 2.0, 3.0], dtype=np.float64),
+            "dec": np.array([-1.0, -2.0, -3.0], dtype=np.float32),
+            "healpix": np.array([7, 8, 9], dtype=np.int64),
+        }
+    )
+
+
+def test_add_catalog_columns_matches_object_ids():
+    dataset = _dataset(["b'c'", "b'a'"])
+    mapped = add_catalog_columns(
+        dataset,
+        _catalog(),
+        ["ra", "dec", "healpix"],
+        lambda object_id: object_id.strip("b'"),
+        batch_size=1,
+    )
+    assert mapped["ra"] == [3.0, 1.0]
+    assert mapped["dec"] == [-3.0, -1.0]
+    assert mapped["healpix"] == [9, 7]
+    # the other columns are carried over, the added ones keep the catalog dtypes
+    assert mapped["flux"] == [0.0, 1.0]
+    assert mapped.features["ra"].dtype == "float64"
+    assert mapped.features["dec"].dtype == "float32"
+    assert mapped.features["healpix"].dtype == "int64"
+
+
+def test_add_catalog_columns_missing_object_id():
+    with pytest.raises(AssertionError, match="Expected 1 catalog entry for d"):
+        add_catalog_columns(_dataset(["a", "d"]), _catalog(), ["ra"])
+
+
+def test_add_catalog_columns_duplicated_object_id():
+    catalog = _catalog()
+    catalog["object_id"][2] = "a"
+    with pytest.raises(AssertionError, match="Expected 1 catalog entry for a"):
+        add_catalog_columns(_dataset(["b", "a"]), catalog, ["ra"])
@@ -0,0 +1,42 @@
+"""Run one or more transform scripts by catalog name.
+
+run using:
+python -m transform_scripts manga sdss
+
+Each catalog is a transform_<catalog>_to_parquet module of this package, which holds the
+transformer class and the input/output paths of that catalog.
+"""
+
+import pkgutil
+import runpy
+from pathlib import Path
+
+import click
+
+SCRIPT_PREFIX = "transform_"
+SCRIPT_SUFFIX = "_to_parquet"
+
+REGISTRY = {
+    module.name[len(SCRIPT_PREFIX) : -len(SCRIPT_SUFFIX)]: f"{__package__}.{module.name}"
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)])
+    if module.name.startswith(SCRIPT_PREFIX) and module.name.endswith(SCRIPT_SUFFIX)
+}
+
+
+@click.command()
+@click.argument(
+    "catalog_names",
+    nargs=-1,
+    required=True,
+    metavar="CATALOG...",
+    type=click.Choice(sorted(REGISTRY)),
+)
+def main(catalog_names: tuple[str, ...]):
+    """Transform the HDF5 files of the given catalogs to parquet, one after the other."""
+    for catalog_name in catalog_names:
+        click.echo(f"\n=== Transforming {catalog_name} ===")
+        runpy.run_module(REGISTRY[catalog_name], run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
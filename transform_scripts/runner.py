@@ -0,0 +1,101 @@
+"""Shared driver for the transform_*_to_parquet scripts.
+
+HDF5 files are transformed independently of each other, so they are spread over a
+process pool, overlapping HDF5 reads, Arrow table building and decompression across cores.
+"""
+
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Type, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from upath import UPath
+
+from catalog_functions.utils import BaseTransformer
+
+# ZSTD compresses these catalogs much better than the default snappy at similar decode speed
+PARQUET_WRITER_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "data_page_size": 1 << 20,
+}
+ROW_GROUP_SIZE = 128 * 1024
+# Caps the default number of worker processes, e.g. when several catalogs are transformed
+# side by side (verify.py --jobs)
+WORKERS_ENV_VAR = "TRANSFORM_WORKERS"
+
+
+def list_hdf5_files(
+    path: List[Union[str, Path, UPath]] | Union[str, Path, UPath],
+) -> list:
+    """Return the HDF5 files of a directory (sorted), or the given file(s) as a list."""
+    if isinstance(path, list):
+        return path
+    upath = UPath(path)
+    if upath.is_dir():
+        suffixes = {".h5", ".hdf5"}
+        return sorted(p for p in upath.glob("*.h*5") if p.suffix in suffixes)
+    return [path]
+
+
+def _transform_file(
+    transformer_klass: Type[BaseTransformer], file_path: Union[str, Path, UPath]
+) -> pa.Table:
+    return transformer_klass().transform_from_hdf5_file(file_path)
+
+
+def run(
+    transformer_klass: Type[BaseTransformer],
+    input_path: List[Union[str, Path, UPath]] | Union[str, Path, UPath],
+    output_file: Union[str, Path],
+    workers: int | None = None,
+) -> pa.Schema:
+    """Transform HDF5 file(s) to a single parquet file, one file per worker process.
+
+    The per-file tables are written to the parquet file as they come in (in input
+    order), so only the tables not yet written are held in memory and no concatenated
+    copy of the whole catalog is ever built.
+
+    Args:
+        transformer_klass: The catalog transformer class, instantiated in each worker.
+        input_path: A directory of HDF5 files, a single HDF5 file or a list of files.
+        output_file: Path of the parquet file to write.
+        workers: Number of worker processes. Defaults to the TRANSFORM_WORKERS
+            environment variable, or else the number of CPUs.
+
+    Returns:
+        pa.Schema: The schema of the written table.
+    """
+    files = list_hdf5_files(input_path)
+    if not files:
+        raise ValueError(f"No HDF5 files found for {input_path}")
+    workers = workers or int(os.environ.get(WORKERS_ENV_VAR, 0)) or os.cpu_count()
+    workers = min(workers, len(files))
+
+    print(f"Transforming {len(files)} HDF5 file(s) to Arrow table...")
+    with contextlib.ExitStack() as stack:
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            tables = executor.map(
+                _transform_file, [transformer_klass] * len(files), files
+            )
+        else:
+            tables = (_transform_file(transformer_klass, f) for f in files)
+
+        writer = None
+        num_rows = 0
+        for table in tables:
+            if writer is None:
+                writer = stack.enter_context(
+                    pq.ParquetWriter(output_file, table.schema, **PARQUET_WRITER_OPTIONS)
+                )
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+            num_rows += table.num_rows
+
+    print(f"\nTable shape: {num_rows} rows, {len(writer.schema)} columns")
+    print(f"\nSchema:\n{writer.schema}")
+    print(f"\nWrote output to {output_file}")
+    return writer.schema
@@ -1,14 +1,23 @@
 import pyarrow as pa
 import pyarrow.compute as pc
 import pyarrow.parquet as pq
-from datasets import load_from_disk
+import json
+import os
+import sys
 import warnings
 import click
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 from typing import TypedDict
 
 
+# Below this many columns, starting a thread pool costs more than it saves
+MIN_COLUMNS_FOR_THREADS = 8
+# Rows compared per Arrow kernel call, keeping the intermediate arrays cache-sized
+COMPARE_WINDOW_ROWS = 64 * 1024
+
+
 class ComparisonIssue(TypedDict):
     type: str
     message: str
@@ -20,67 +29,109 @@ class ComparisonIssue(TypedDict):
 def normalize_coordinate_columns(table, table_name):
     """Rename RA->ra and DEC->dec if present, for case-insensitive comparison."""
     names = table.column_names
+    renames = {}
     for old, new in [("RA", "ra"), ("DEC", "dec")]:
         if old in names and new not in names:
             warnings.warn(
                 f"Renaming column '{old}' to '{new}' in {table_name} for comparison"
             )
-            idx = names.index(old)
-            field = table.schema.field(idx).with_name(new)
-            table = table.set_column(idx, field, table.column(idx))
-            names = table.column_names
-    return table
+            renames[old] = new
+    if not renames:
+        return table
+    # a single schema-only rename, the column buffers are shared
+    return table.rename_columns([renames.get(name, name) for name in names])
 
 
 def get_all_field_names(schema, prefix=""):
-    """Recursively extract all field names from a schema, including nested struct fields.
+    """Extract all field names from a schema, including nested struct fields.
 
     Returns a set of field names like: {'col1', 'struct_col.field1', 'struct_col.field2'}
     """
     field_names = set()
+    stack = [(prefix, field) for field in schema]
 
-    for field in schema:
-        field_path = f"{prefix}{field.name}" if prefix else field.name
+    while stack:
+        field_prefix, field = stack.pop()
+        field_path = f"{field_prefix}{field.name}"
         field_names.add(field_path)
 
-        # If this field is a struct, recurse into its fields
+        # If this field is a struct, visit its fields too
         if pa.types.is_struct(field.type):
-            nested_names = get_all_field_names(field.type, prefix=f"{field_path}.")
-            field_names.update(nested_names)
+            stack.extend((f"{field_path}.", nested) for nested in field.type)
 
     return field_names
 
 
 def flatten_struct_columns(table):
-    """Flatten nested struct columns to top-level columns."""
-    new_columns = {}
-
-    for col_name in table.column_names:
-        col = table[col_name]
-        col_type = table.schema.field(col_name).type
-
-        if pa.types.is_struct(col_type):
-            # combine_chunks() + field(i) is zero-copy, unlike to_pylist()
-            struct_col = col.combine_chunks()
-            for i, field in enumerate(col_type):
-                if field.name not in new_columns:
-                    new_columns[f"{col_name}.{field.name}"] = struct_col.field(i)
-        else:
-            new_columns[col_name] = col
+    """Flatten nested struct columns to top-level columns named 'struct_col.field'.
+
+    Only one level is flattened, structs nested in structs stay struct columns. The
+    flattening is done chunk by chunk in C++ and keeps the struct validity on its fields.
+    """
+    return table.flatten()
+
+
+def read_arrow_stream(file_path):
+    """Read an Arrow IPC stream file as a table backed by a memory map (no copy)."""
+    return pa.ipc.open_stream(pa.memory_map(str(file_path))).read_all()
+
+
+def read_empty_dataset(path):
+    """An empty table with the schema of a saved Dataset that has no data files."""
+    from datasets import Features
+
+    info = json.loads((path / "dataset_info.json").read_text())
+    return Features.from_dict(info["features"]).arrow_schema.empty_table()
 
-    return pa.table(new_columns)
 
+def projected_names(names, columns):
+    """The names to load for the given columns, matched case-insensitively (e.g. RA/ra)."""
+    if columns is None:
+        return list(names)
+    wanted = {col.lower() for col in columns}
+    return [name for name in names if name.lower() in wanted]
 
-def load_table(file_path):
-    """Load a PyArrow table from either a parquet file or datasets directory."""
+
+def missing_columns(names, columns):
+    """The given columns that match none of the names, with the rule of projected_names."""
+    present = {name.lower() for name in names}
+    return [col for col in columns if col.lower() not in present]
+
+
+def load_table(file_path, columns=None):
+    """Load a PyArrow table from either a parquet file or datasets directory.
+
+    If columns is given, only those top-level columns are read (parquet) or kept.
+    """
     path = Path(file_path)
 
     if path.is_file() and path.suffix == ".parquet":
-        return pq.read_table(file_path)
+        if columns is None:
+            return pq.read_table(file_path)
+        names = projected_names(pq.read_schema(file_path).names, columns)
+        return pq.read_table(file_path, columns=names)
 
     if path.is_dir():
-        dataset = load_from_disk(file_path)
-        return dataset.data.table
+        state_file = path / "state.json"
+        if state_file.is_file():
+            data_files = json.loads(state_file.read_text())["_data_files"]
+            if data_files:
+                # A saved Dataset is a list of Arrow stream files, memory-map them directly
+                table = pa.concat_tables(
+                    read_arrow_stream(path / data_file["filename"])
+                    for data_file in data_files
+                )
+            else:
+                # An empty Dataset has no data files, its schema is in its features
+                table = read_empty_dataset(path)
+        else:
+            # datasets is slow to import, only pay for it for other layouts (e.g. a DatasetDict)
+            from datasets import load_from_disk
+
+            table = load_from_disk(file_path).data.table
+        if columns is None:
+            return table
+        return table.select(projected_names(table.column_names, columns))
 
     raise ValueError(f"Unsupported file type or format: {file_path}")
 
@@ -133,16 +184,14 @@ def truncate_long_arrays(obj, max_items=5):
         Truncated version of the object
     """
     if isinstance(obj, list):
+        items = obj[:max_items]
+        if any(isinstance(item, (list, dict)) for item in items):
+            # Recursively process the items that are kept
+            items = [truncate_long_arrays(item, max_items) for item in items]
         if len(obj) > max_items:
             # Truncate and add ellipsis marker
-            truncated = [
-                truncate_long_arrays(item, max_items) for item in obj[:max_items]
-            ]
-            truncated.append("...")
-            return truncated
-        else:
-            # Recursively process all items
-            return [truncate_long_arrays(item, max_items) for item in obj]
+            items.append("...")
+        return items
     elif isinstance(obj, dict):
         # Recursively process dict values
         return {k: truncate_long_arrays(v, max_items) for k, v in obj.items()}
@@ -151,6 +200,88 @@ def truncate_long_arrays(obj, max_items=5):
         return obj
 
 
+def is_list_type(col_type):
+    """Whether a type is a list, large_list or fixed_size_list type."""
+    return (
+        pa.types.is_list(col_type)
+        or pa.types.is_large_list(col_type)
+        or pa.types.is_fixed_size_list(col_type)
+    )
+
+
+def list_mismatch_rows(col1, col2):
+    """Indices of the rows where two list columns differ, or None if their nesting depths differ.
+
+    All list levels are flattened and the leaf values are compared in one vectorized pass
+    (with float_mismatch_mask's tolerance for floats), then mapped back to their rows.
+    Rows whose lists differ in length at any level are mismatches, the values of the
+    other rows are compared.
+    """
+    parents = None
+    length_rows = []
+    while is_list_type(col1.type) and is_list_type(col2.type):
+        lengths_differ = mismatch_mask(pc.list_value_length(col1), pc.list_value_length(col2))
+        if pc.any(lengths_differ).as_py():
+            # the values of these lists cannot be paired, keep only the lists of equal length
+            differ = pc.indices_nonzero(lengths_differ)
+            length_rows.append((differ if parents is None else parents.take(differ)).to_numpy())
+            same_length = pc.invert(lengths_differ)
+            col1 = col1.filter(same_length)
+            col2 = col2.filter(same_length)
+            parents = (
+                pc.indices_nonzero(same_length)
+                if parents is None
+                else parents.filter(same_length)
+            )
+        level_parents = pc.list_parent_indices(col1)
+        parents = level_parents if parents is None else parents.take(level_parents)
+        col1 = pc.list_flatten(col1)
+        col2 = pc.list_flatten(col2)
+    if is_list_type(col1.type) or is_list_type(col2.type):
+        return None  # different nesting depths
+    is_float_type = pa.types.is_floating(col1.type) or pa.types.is_floating(col2.type)
+    mask_func = float_mismatch_mask if is_float_type else mismatch_mask
+    value_mask = mask_func(col1, col2)
+    value_rows = parents.filter(value_mask).to_numpy().astype(np.int64)
+    return np.unique(np.concatenate([value_rows] + length_rows).astype(np.int64))
+
+
+def list_struct_field(col, field_name):
+    """A field of a list<struct> column, as a list column with one list per row of col."""
+    chunks = col.chunks if isinstance(col, pa.ChunkedArray) else [col]
+    field_chunks = []
+    for chunk in chunks:
+        field_chunk = type(chunk).from_arrays(
+            chunk.offsets, pc.struct_field(chunk.values, field_name)
+        )
+        if chunk.null_count:
+            # from_arrays takes no null bitmap for sliced offsets, null lists are set here
+            field_chunk = pc.if_else(
+                chunk.is_valid(), field_chunk, pa.scalar(None, field_chunk.type)
+            )
+        field_chunks.append(field_chunk)
+    return pa.chunked_array(
+        field_chunks, type=pa.list_(col.type.value_type.field(field_name).type)
+    )
+
+
+def row_samples(col1, col2, rows):
+    """Mismatch samples of the given rows, converting only those rows to Python."""
+    rows = pa.array(rows, type=pa.int64())
+    return [
+        {
+            "index": i,
+            "left": truncate_long_arrays(left),
+            "right": truncate_long_arrays(right),
+        }
+        for i, left, right in zip(
+            rows.to_pylist(),
+            col1.take(rows).to_pylist(),
+            col2.take(rows).to_pylist(),
+        )
+    ]
+
+
 def compare_nested_list_column(col1, col2, col_name, col_type):
     """
     Compare nested list columns using PyArrow native operations.
@@ -169,20 +300,8 @@ def compare_nested_list_column(col1, col2, col_name, col_type):
         if col1.equals(col2):
             return {"": (True, [])}
 
-        list1 = col1[:5].to_pylist()
-        list2 = col2[:5].to_pylist()
-        mismatch_indices = [
-            i for i in range(min(len(list1), len(list2))) if list1[i] != list2[i]
-        ]
-        sample_data = [
-            {
-                "index": i,
-                "left": truncate_long_arrays(list1[i]),
-                "right": truncate_long_arrays(list2[i]),
-            }
-            for i in mismatch_indices[:3]
-        ]
-        return {"": (False, sample_data)}
+        # Compare the Python values window by window, stopping at the third mismatch
+        return {"": nested_columns_equal_or_samples(col1, col2)}
 
     value_type = col_type.value_type
 
@@ -197,8 +316,8 @@ def compare_nested_list_column(col1, col2, col_name, col_type):
         col2_value_type = col2.type.value_type
 
         # Check for type mismatch (one extension, one not)
-        has_ext1 = hasattr(col1_value_type, "storage_type")
-        has_ext2 = hasattr(col2_value_type, "storage_type")
+        has_ext1 = isinstance(col1_value_type, pa.BaseExtensionType)
+        has_ext2 = isinstance(col2_value_type, pa.BaseExtensionType)
 
         if has_ext1 != has_ext2:
             warnings.warn(
@@ -206,14 +325,8 @@ def compare_nested_list_column(col1, col2, col_name, col_type):
                 f"left={col1_value_type}, right={col2_value_type}. "
                 f"Casting to storage types for value comparison."
             )
-            if has_ext1:
-                storage_type1 = pa.list_(col1_value_type.storage_type)
-                col1_compare = col1.cast(storage_type1)
-            if has_ext2:
-                storage_type2 = pa.list_(col2_value_type.storage_type)
-                col2_compare = col2.cast(storage_type2)
-
-        # If both or neither have extension types, try to compare
+
+        # Extension values are compared on their storage types
         if has_ext1:
             # Cast list<extension> to list<storage>
             storage_type1 = pa.list_(col1_value_type.storage_type)
@@ -226,48 +339,51 @@ def compare_nested_list_column(col1, col2, col_name, col_type):
         if col1_compare.equals(col2_compare):
             return {"": (True, [])}
 
-        # For numeric types, use NaN-aware comparison
-        # Check if the value type is a numeric type that might contain NaN
-        is_float_type = pa.types.is_floating(col1_value_type) or pa.types.is_floating(col2_value_type)
+        # Floats are compared with a NaN-aware tolerance, decided from the leaf types
+        try:
+            mismatch_rows = list_mismatch_rows(col1_compare, col2_compare)
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+            mismatch_rows = None  # Fall through to Python list comparison
+        if mismatch_rows is not None:
+            if len(mismatch_rows) == 0:
+                return {"": (True, [])}
+            return {"": (False, row_samples(col1, col2, mismatch_rows[:3]))}
+
+        # Compare the Python values window by window, stopping at the third mismatch
+        return {"": nested_columns_equal_or_samples(col1, col2)}
 
-        if is_float_type:
-            # Convert to numpy for NaN-aware comparison
-            try:
-                import numpy as np
-                # Flatten both columns to 1D arrays for comparison
-                arr1_flat = pc.list_flatten(col1_compare).to_numpy()
-                arr2_flat = pc.list_flatten(col2_compare).to_numpy()
-
-                if np.allclose(arr1_flat, arr2_flat, rtol=1e-5, atol=1e-8, equal_nan=True):
-                    return {"": (True, [])}
-            except Exception:
-                pass  # Fall through to Python list comparison
-
-        list1 = col1[:5].to_pylist()
-        list2 = col2[:5].to_pylist()
-        mismatch_indices = [
-            i for i in range(min(len(list1), len(list2))) if list1[i] != list2[i]
-        ]
-        sample_data = [
-            {
-                "index": i,
-                "left": truncate_long_arrays(list1[i]),
-                "right": truncate_long_arrays(list2[i]),
-            }
-            for i in mismatch_indices[:3]
-        ]
-        return {"": (False, sample_data)}
+    # Identical columns need no per-field flattening
+    if col1.equals(col2):
+        return {field.name: (True, []) for field in value_type}
 
     # Compare each struct field separately using PyArrow native ops
     field_results = {}
 
+    lengths_differ = mismatch_mask(pc.list_value_length(col1), pc.list_value_length(col2))
+    if pc.any(lengths_differ).as_py():
+        # The flattened fields cannot be paired point by point, the fields are compared
+        # row by row instead, rows whose lists differ in length being mismatches
+        for field in value_type:
+            try:
+                field_results[field.name] = nested_columns_equal_or_samples(
+                    list_struct_field(col1, field.name),
+                    list_struct_field(col2, field.name),
+                )
+            except Exception as e:
+                field_results[field.name] = (False, [{"error": str(e)}])
+        return field_results
+    flattened1 = flattened2 = None
+
     for field in value_type:
         field_name = field.name
 
         try:
             # Extract field from nested struct using PyArrow compute
-            flattened1 = pc.list_flatten(col1)
-            flattened2 = pc.list_flatten(col2)
+            if flattened1 is None:
+                flattened1 = pc.list_flatten(col1)
+                flattened2 = pc.list_flatten(col2)
+                # row of each flattened value, the samples report rows like other columns
+                parents = pc.list_parent_indices(col1)
 
             field1 = pc.struct_field(flattened1, field_name)
             field2 = pc.struct_field(flattened2, field_name)
@@ -276,88 +392,347 @@ def compare_nested_list_column(col1, col2, col_name, col_type):
             type1 = field1.type
             type2 = field2.type
 
-            # Check if either is an extension type
-            if hasattr(type1, "storage_type") or hasattr(type2, "storage_type"):
-                # Cast both to storage type to compare underlying values
-                if hasattr(type1, "storage_type"):
-                    field1 = field1.cast(type1.storage_type)
-                if hasattr(type2, "storage_type"):
-                    field2 = field2.cast(type2.storage_type)
+            # Cast extension types to their storage type to compare underlying values
+            if isinstance(type1, pa.BaseExtensionType):
+                field1 = field1.cast(type1.storage_type)
+            if isinstance(type2, pa.BaseExtensionType):
+                field2 = field2.cast(type2.storage_type)
 
             if field1.equals(field2):
                 field_results[field_name] = (True, [])
-            else:
-                # Convert only first 5 rows to Python for samples
-                # Need to extract this field from each row
-                col1_slice = col1[:5]
-                col2_slice = col2[:5]
+                continue
+            try:
+                # Only the sampled mismatches are converted to Python
+                field_equal, field_samples = arrow_columns_equal_or_samples(
+                    field1, field2
+                )
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+                # No comparison kernel for this type or differing list lengths,
+                # compare the Python values window by window, stopping at the
+                # third mismatch
+                field_equal, field_samples = nested_columns_equal_or_samples(
+                    field1, field2
+                )
+            for sample in field_samples:
+                sample["index"] = parents[sample["index"]].as_py()
+            field_results[field_name] = (field_equal, field_samples)
 
-                flattened1_slice = pc.list_flatten(col1_slice)
-                flattened2_slice = pc.list_flatten(col2_slice)
+        except Exception as e:
+            # If we can't extract the field, mark as mismatch
+            field_results[field_name] = (False, [{"error": str(e)}])
 
-                field1_slice = pc.struct_field(flattened1_slice, field_name).to_pylist()
-                field2_slice = pc.struct_field(flattened2_slice, field_name).to_pylist()
+    return field_results
 
-                # Find mismatches
-                mismatch_indices = [
-                    i
-                    for i in range(min(len(field1_slice), len(field2_slice)))
-                    if field1_slice[i] != field2_slice[i]
-                ]
 
-                sample_data = [
-                    {
-                        "index": i,
-                        "left": truncate_long_arrays(field1_slice[i]),
-                        "right": truncate_long_arrays(field2_slice[i]),
-                    }
-                    for i in mismatch_indices[:3]
-                ]
+def mismatch_mask(col1, col2):
+    """Boolean mask of the rows where two columns differ, computed with Arrow kernels.
 
-                field_results[field_name] = (False, sample_data)
+    Rows that are null on both sides are considered equal.
+    """
+    mask = pc.not_equal(col1, col2)
+    # not_equal is null as soon as one side is null, these rows differ unless both are null
+    return pc.coalesce(mask, pc.not_equal(pc.is_null(col1), pc.is_null(col2)))
 
-        except Exception as e:
-            # If we can't extract the field, mark as mismatch
-            field_results[field_name] = (False, [{"error": str(e)}])
 
-    return field_results
+def float_mismatch_mask(col1, col2, rtol=1e-5, atol=1e-8):
+    """Like mismatch_mask, but with the tolerances of np.isclose and NaNs equal to each other.
+
+    Nulls are compared as NaN, like the NumPy arrays of to_numpy(), so a null matches
+    both a null and a NaN. Columns of the same float32/float64 type are compared in that
+    type, only other combinations are cast to float64.
+    """
+    float_type = col1.type
+    if float_type != col2.type or float_type not in (pa.float32(), pa.float64()):
+        float_type = pa.float64()
+    nan = pa.scalar(float("nan"), type=float_type)
+    a = pc.fill_null(col1.cast(float_type), nan)
+    b = pc.fill_null(col2.cast(float_type), nan)
+    # typed tolerances, a Python float would promote float32 values to float64
+    rtol = pa.scalar(rtol, type=float_type)
+    atol = pa.scalar(atol, type=float_type)
+    within_tolerance = pc.less_equal(
+        pc.abs(pc.subtract(a, b)), pc.add(pc.multiply(pc.abs(b), rtol), atol)
+    )
+    # infinities and NaNs have no meaningful difference, they only match the same value
+    same_non_finite = pc.or_(pc.equal(a, b), pc.and_(pc.is_nan(a), pc.is_nan(b)))
+    close = pc.if_else(
+        pc.and_(pc.is_finite(a), pc.is_finite(b)), within_tolerance, same_non_finite
+    )
+    return pc.invert(close)
+
+
+def arrow_columns_equal_or_samples(
+    col1, col2, mismatch_number=3, mask_func=mismatch_mask, window=COMPARE_WINDOW_ROWS
+) -> tuple[bool, list[dict]]:
+    """Compare two columns with Arrow compute, only converting mismatched samples to Python.
+
+    The columns are compared one window of rows at a time, so the masks and float
+    intermediates stay window-sized, and the comparison stops as soon as
+    mismatch_number mismatched rows have been found.
+    """
+    rows = []
+    for start in range(0, len(col1), window):
+        mask = mask_func(col1.slice(start, window), col2.slice(start, window))
+        if not pc.any(mask).as_py():
+            continue
+        window_rows = pc.indices_nonzero(mask)[: mismatch_number - len(rows)]
+        rows += [start + i for i in window_rows.to_pylist()]
+        if len(rows) >= mismatch_number:
+            break
+    if not rows:
+        return True, []
+    return False, row_samples(col1, col2, rows)
 
 
 def columns_equal_or_samples(
     arr1: np.ndarray, arr2: np.ndarray
 ) -> tuple[bool, list[tuple[int, any, any]]]:
-    columns_equal = np.allclose(
-        arr1,
-        arr2,
-        rtol=1e-5,
-        atol=1e-8,
-        equal_nan=True,
-    )
-    if not columns_equal:
-        # Find mismatched indices
-        mask = ~np.isclose(arr1, arr2, rtol=1e-5, atol=1e-8, equal_nan=True)
-        mismatch_indices = np.where(mask)[0][:3]
+    if arr1.shape != arr2.shape:
+        # np.isclose would broadcast e.g. one value per row against several
+        raise ValueError(f"Cannot compare arrays of shapes {arr1.shape} and {arr2.shape}")
+    close = np.isclose(arr1, arr2, rtol=1e-5, atol=1e-8, equal_nan=True)
+    if not close.all():
+        # Find mismatched indices, a row of a 2D array differs if any of its values does
+        mismatch_indices = np.flatnonzero(~close.reshape(len(close), -1).all(axis=1))[:3]
+        # one batched conversion to Python objects per side
         sample_data = [
-            {"index": i, "left": arr1[i], "right": arr2[i]} for i in mismatch_indices
+            {
+                "index": i,
+                "left": truncate_long_arrays(left),
+                "right": truncate_long_arrays(right),
+            }
+            for i, left, right in zip(
+                mismatch_indices.tolist(),
+                arr1[mismatch_indices].tolist(),
+                arr2[mismatch_indices].tolist(),
+            )
         ]
         return False, sample_data
     return True, []
 
 
+def is_float_list_type(col_type):
+    """Whether a type is a (possibly nested) list type with floating point values."""
+    depth = 0
+    while is_list_type(col_type):
+        col_type = col_type.value_type
+        depth += 1
+    return depth > 0 and pa.types.is_floating(col_type)
+
+
+def nested_columns_equal_or_samples(
+    col1, col2, mismatch_number=3, window=256
+) -> tuple[bool, list[dict]]:
+    """Compare two nested columns, vectorized for lists and otherwise one window at a time.
+
+    List columns are compared on their flattened values with Arrow compute. Other
+    columns are converted to Python one window at a time, stopping as soon as
+    mismatch_number mismatched rows have been found.
+    """
+    if is_list_type(col1.type) and is_list_type(col2.type):
+        try:
+            mismatch_rows = list_mismatch_rows(col1, col2)
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+            mismatch_rows = None  # e.g. struct values, compare the Python values below
+        if mismatch_rows is not None:
+            return len(mismatch_rows) == 0, row_samples(
+                col1, col2, mismatch_rows[:mismatch_number]
+            )
+
+    # Lists of floats are compared with the float tolerance, decided from the schema
+    float_lists = is_float_list_type(col1.type) and is_float_list_type(col2.type)
+    sample_data = []
+    for start in range(0, len(col1), window):
+        list1 = col1.slice(start, window).to_pylist()
+        list2 = col2.slice(start, window).to_pylist()
+        if list1 == list2:
+            continue
+        window_samples = None
+        if float_lists:
+            try:
+                _, window_samples = columns_equal_or_samples(
+                    np.array(list1), np.array(list2)
+                )
+            except (ValueError, TypeError):
+                pass  # ragged or differing list lengths, or nulls: compare the Python values below
+            else:
+                for sample in window_samples:
+                    sample["index"] += start
+        if window_samples is None:
+            window_samples = [
+                {
+                    "index": start + i,
+                    "left": truncate_long_arrays(left),
+                    "right": truncate_long_arrays(right),
+                }
+                for i, (left, right) in enumerate(zip(list1, list2, strict=True))
+                if left != right
+            ]
+        sample_data += window_samples
+        if len(sample_data) >= mismatch_number:
+            break
+    return not sample_data, sample_data[:mismatch_number]
+
+
+def compare_column(
+    col1, col2, col_name, col_type, mismatch_number=3
+) -> list[ComparisonIssue]:
+    """Compare two aligned columns, returning the issues found."""
+    issues = []
+    # Structs are flattened, but list columns remain nested
+    if pa.types.is_nested(col_type) and pa.types.is_list(col_type):
+        # Use PyArrow-native comparison for nested list columns
+        field_results = compare_nested_list_column(col1, col2, col_name, col_type)
+
+        # Report each mismatched field separately
+        for field_name, (field_equal, field_samples) in field_results.items():
+            if not field_equal:
+                # Create full field path (e.g., "lightcurve.group")
+                full_field_name = f"{col_name}.{field_name}" if field_name else col_name
+
+                issues.append(
+                    {
+                        "type": "column_values",
+                        "message": f"Column '{full_field_name}' has differences",
+                        "column": full_field_name,
+                        "samples": field_samples,
+                        "table": None,
+                    }
+                )
+
+        return issues
+    elif pa.types.is_nested(col_type) and col1.equals(col2):
+        # identical columns need no conversion to Python
+        columns_equal, sample_data = True, []
+    elif pa.types.is_nested(col_type):
+        columns_equal, sample_data = nested_columns_equal_or_samples(
+            col1, col2, mismatch_number
+        )
+    elif pa.types.is_floating(col_type):
+        columns_equal, sample_data = arrow_columns_equal_or_samples(
+            col1, col2, mismatch_number, float_mismatch_mask
+        )
+    else:
+        try:
+            columns_equal, sample_data = arrow_columns_equal_or_samples(
+                col1, col2, mismatch_number
+            )
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+            # No comparison kernel for this type (or differing types), compare the
+            # Python values one window at a time
+            columns_equal, sample_data = nested_columns_equal_or_samples(
+                col1, col2, mismatch_number
+            )
+
+    if not columns_equal and sample_data:
+        issues.append(
+            {
+                "type": "column_values",
+                "message": f"Column '{col_name}' has differences",
+                "column": col_name,
+                "samples": sample_data,
+                "table": None,
+            }
+        )
+    return issues
+
+
+def integer_sort_keys(key1, key2):
+    """Cast two digit-only string key columns (e.g. object ids) to integers.
+
+    Integers sort much faster than strings. The keys are only cast if both of them can be
+    and the integers convert back to the same strings (so "007" and "7" never become the
+    same key), so both tables are always sorted the same way and their rows still align.
+    """
+    if all(
+        pa.types.is_string(key.type) or pa.types.is_large_string(key.type)
+        for key in (key1, key2)
+    ):
+        try:
+            int_keys = key1.cast(pa.uint64()), key2.cast(pa.uint64())
+        except pa.ArrowInvalid:
+            return key1, key2  # not all digits, sort the strings
+        if all(
+            int_key.cast(key.type).equals(key)
+            for int_key, key in zip(int_keys, (key1, key2))
+        ):
+            return int_keys
+    return key1, key2
+
+
+def sort_order(key):
+    """Indices that sort a key column, or None if it is already sorted."""
+    indices = pc.sort_indices(key)
+    if np.array_equal(indices.to_numpy(), np.arange(len(indices))):
+        return None
+    return indices
+
+
+def align_order(key1, key2):
+    """Indices of the rows of key2 matching each row of key1, or None if the keys are not unique.
+
+    Rows are paired with a hash lookup, which only succeeds when both key columns have the
+    same type and hold the same unique (non-null) values.
+    """
+    if key1.type != key2.type:
+        return None  # e.g. int64 vs string ids, sort each table and report the mismatch
+    num_rows = len(key1)
+    if (
+        pc.count_distinct(key1).as_py() != num_rows
+        or pc.count_distinct(key2).as_py() != num_rows
+    ):
+        return None
+    indices = pc.index_in(key1, value_set=key2)
+    if indices.null_count:
+        return None
+    return indices
+
+
+def take_rows(col, indices):
+    """Return the rows of a column in the given order (None keeps the column as is)."""
+    return col if indices is None else col.take(indices)
+
+
+def select_columns(table, columns):
+    """Return a table with only those of the given columns that the table has."""
+    return table.select(projected_names(table.column_names, columns))
+
+
 def compare_tables(
     datasets_table,
     rewritten_table,
     label1="Table 1",
     label2="Table 2",
     mismatch_number=3,
+    columns=None,
 ):
-    """Compare two PyArrow tables and report all differences."""
+    """Compare two PyArrow tables and report all differences.
+
+    If columns is given, only those top-level columns are compared, all other
+    columns (and their nested fields) are never touched. The index of a mismatch
+    sample is the position of its row in the first table, however the rows are paired.
+    """
     # general comparison report
     issues = []
     sample_data = []
 
     datasets_table = normalize_coordinate_columns(datasets_table, label1)
     rewritten_table = normalize_coordinate_columns(rewritten_table, label2)
+    if columns is not None:
+        # a requested column missing from a table (e.g. a typo) must not pass unnoticed
+        for table, label in ((datasets_table, label1), (rewritten_table, label2)):
+            missing = missing_columns(table.column_names, columns)
+            if missing:
+                issues.append(
+                    {
+                        "type": "columns",
+                        "column": None,
+                        "message": f"{label} is missing requested columns: {missing}",
+                        "table": label,
+                    }
+                )
+        datasets_table = select_columns(datasets_table, columns)
+        rewritten_table = select_columns(rewritten_table, columns)
     # we'll ignore the column types in the schema comparison, since datasets can make some optimizations, e.g.
     # list<item: extension<datasets.features.features.Array2DExtensionType<Array2DExtensionType>>>
     fields1 = get_all_field_names(datasets_table.schema)
@@ -385,9 +760,6 @@ def compare_tables(
             }
         )
 
-    datasets_table = flatten_struct_columns(datasets_table)
-    rewritten_table = flatten_struct_columns(rewritten_table)
-
     print(f"\n{'=' * 70}")
     print(f"COMPARISON SUMMARY")
     print(f"{'=' * 70}")
@@ -409,8 +781,19 @@ def compare_tables(
         )
         # we cannot really compare more if row counts differ
         return issues
+
+    # struct columns are only flattened once the row counts are known to match, and the
+    # columns are combined into single chunks for the sort, take and compare kernels below
+    datasets_table = flatten_struct_columns(datasets_table).combine_chunks()
+    rewritten_table = flatten_struct_columns(rewritten_table).combine_chunks()
+
     # we only check for ra/dec columns in the rewritten table to ensure are of correct type
-    issues += check_for_coordinate_cols(rewritten_table, label2)
+    if columns is None:
+        issues += check_for_coordinate_cols(rewritten_table, label2)
+    else:
+        for col_name in ("ra", "dec"):
+            if projected_names([col_name], columns):
+                issues += check_for_col(rewritten_table, col_name, label2)
 
     # Check columns
     cols1 = set(datasets_table.column_names)
@@ -442,6 +825,9 @@ def compare_tables(
 
     # Compare common columns (only if both tables have rows)
     if common_cols and datasets_table.num_rows > 0 and rewritten_table.num_rows > 0:
+        # name -> type once, schema.field(name) is a linear scan over the columns
+        column_types = dict(zip(datasets_table.schema.names, datasets_table.schema.types))
+        compared_cols = sorted(common_cols)
         # Find a sortable column for comparison - prefer object_id for stability
         sort_column = None
         preferred_sort_cols = ["object_id", "source_id", "id"]
@@ -450,8 +836,8 @@ def compare_tables(
                 sort_column = col_name
                 break
         if sort_column is None:
-            for col_name in sorted(common_cols):
-                col_type = datasets_table.schema.field(col_name).type
+            for col_name in compared_cols:
+                col_type = column_types[col_name]
                 if not pa.types.is_nested(col_type):
                     sort_column = col_name
                     break
@@ -467,110 +853,52 @@ def compare_tables(
             )
         else:
             print(f"\nSorting by column: {sort_column}")
-            datasets_table_sorted = datasets_table.sort_by(sort_column)
-            rewritten_table_sorted = rewritten_table.sort_by(sort_column)
-
-            print(f"\nComparing {len(common_cols)} common columns...")
-            for col_name in sorted(common_cols):
-                col1 = datasets_table_sorted[col_name]
-                col2 = rewritten_table_sorted[col_name]
-
-                col_type = datasets_table_sorted.schema.field(col_name).type
-                # Structs are flattened, but list columns remain nested
-                if pa.types.is_nested(col_type) and pa.types.is_list(col_type):
-                    # Use PyArrow-native comparison for nested list columns
-                    field_results = compare_nested_list_column(
-                        col1, col2, col_name, col_type
+            if datasets_table[sort_column].equals(rewritten_table[sort_column]):
+                # The rows are already aligned, the (stable) sort would permute both alike
+                order1 = order2 = None
+            else:
+                # Unique keys are paired by hash lookup, leaving the first table in place
+                order1 = None
+                order2 = align_order(
+                    datasets_table[sort_column], rewritten_table[sort_column]
+                )
+                if order2 is None:
+                    key1, key2 = integer_sort_keys(
+                        datasets_table[sort_column], rewritten_table[sort_column]
                     )
+                    order1 = sort_order(key1)
+                    order2 = sort_order(key2)
 
-                    # Report each mismatched field separately
-                    for field_name, (
-                        field_equal,
-                        field_samples,
-                    ) in field_results.items():
-                        if not field_equal:
-                            # Create full field path (e.g., "lightcurve.group")
-                            full_field_name = (
-                                f"{col_name}.{field_name}" if field_name else col_name
-                            )
-
-                            issues.append(
-                                {
-                                    "type": "column_values",
-                                    "message": f"Column '{full_field_name}' has differences",
-                                    "column": full_field_name,
-                                    "samples": field_samples,
-                                    "table": None,
-                                }
-                            )
-
-                    # Skip the rest of the comparison logic for this column
-                    continue
-                elif pa.types.is_nested(col_type):
-                    list1 = col1.combine_chunks().to_pylist()
-                    list2 = col2.combine_chunks().to_pylist()
-                    columns_equal = list1 == list2
-                    if not columns_equal:
-                        if (
-                            isinstance(list1[0], list)
-                            and isinstance(list1[0][0], float)
-                            and isinstance(list2[0], list)
-                            and isinstance(list2[0][0], float)
-                        ):
-                            arr1 = np.array(list1)
-                            arr2 = np.array(list2)
-                            columns_equal, sample_data = columns_equal_or_samples(
-                                arr1, arr2
-                            )
-                        else:
-                            # Find mismatched indices
-                            mismatch_indices = [
-                                i
-                                for i in range(min(len(list1), len(list2)))
-                                if list1[i] != list2[i]
-                            ]
-                            sample_data = [
-                                {
-                                    "index": i,
-                                    "left": truncate_long_arrays(list1[i]),
-                                    "right": truncate_long_arrays(list2[i]),
-                                }
-                                for i in mismatch_indices[:3]
-                            ]
-                elif pa.types.is_floating(col_type):
-                    arr1 = col1.to_numpy()
-                    arr2 = col2.to_numpy()
-                    columns_equal, sample_data = columns_equal_or_samples(arr1, arr2)
-                else:
-                    columns_equal = col1.equals(col2)
-                    if not columns_equal:
-                        # Find mismatched indices
-                        arr1 = col1.to_pylist()
-                        arr2 = col2.to_pylist()
-                        mismatch_indices = [
-                            i
-                            for i in range(min(len(arr1), len(arr2)))
-                            if arr1[i] != arr2[i]
-                        ]
-                        sample_data = [
-                            {
-                                "index": i,
-                                "left": truncate_long_arrays(arr1[i]),
-                                "right": truncate_long_arrays(arr2[i]),
-                            }
-                            for i in mismatch_indices[:mismatch_number]
-                        ]
-
-                if not columns_equal and sample_data:
-                    issues.append(
-                        {
-                            "type": "column_values",
-                            "message": f"Column '{col_name}' has differences",
-                            "column": col_name,
-                            "samples": sample_data,
-                            "table": None,
-                        }
-                    )
+            print(f"\nComparing {len(common_cols)} common columns...")
+            rows1 = None if order1 is None else order1.to_numpy()
+
+            def compare_sorted_column(col_name):
+                # Columns are gathered in sorted order one at a time, as they are compared
+                col_issues = compare_column(
+                    take_rows(datasets_table[col_name], order1),
+                    take_rows(rewritten_table[col_name], order2),
+                    col_name,
+                    column_types[col_name],
+                    mismatch_number,
+                )
+                if rows1 is not None:
+                    # the samples index the sorted rows, report the rows of the first table
+                    for issue in col_issues:
+                        for sample in issue["samples"]:
+                            if "index" in sample:
+                                sample["index"] = int(rows1[sample["index"]])
+                return col_issues
+
+            if len(compared_cols) < MIN_COLUMNS_FOR_THREADS:
+                column_issues = map(compare_sorted_column, compared_cols)
+            else:
+                # Arrow kernels release the GIL, so columns are compared in parallel threads
+                with ThreadPoolExecutor(
+                    max_workers=min(os.cpu_count(), len(compared_cols))
+                ) as executor:
+                    column_issues = list(executor.map(compare_sorted_column, compared_cols))
+            for col_issues in column_issues:
+                issues += col_issues
     return issues
 
 
@@ -578,7 +906,13 @@ def compare_tables(
 @click.option("--datasets-file", type=click.Path(exists=True))
 @click.option("--rewritten-file", type=click.Path(exists=True))
 @click.option("--allowed-mismatch-columns", type=str, default="")
-def main(datasets_file, rewritten_file, allowed_mismatch_columns):
+@click.option(
+    "--columns",
+    type=str,
+    default=None,
+    help="Comma-separated top-level columns to load and compare (default: all).",
+)
+def main(datasets_file, rewritten_file, allowed_mismatch_columns, columns):
     """Compare two PyArrow tables from parquet files or datasets directories.
 
     Examples:
@@ -591,20 +925,29 @@ def main(datasets_file, rewritten_file, allowed_mismatch_columns):
 
       # Compare two datasets directories
       python compare.py data/dataset1 data/dataset2
+
+      # Only load and compare some columns
+      python compare.py output1.parquet output2.parquet --columns ra,dec
     """
-    # Load both tables
+    # Load both tables, only reading the requested columns
+    if columns is not None:
+        columns = columns.split(",")
     click.echo(f"Loading first table from: {datasets_file}")
-    datasets_table = load_table(datasets_file)
+    datasets_table = load_table(datasets_file, columns)
 
     click.echo(f"Loading second table from: {rewritten_file}")
-    rewritten_table = load_table(rewritten_file)
+    rewritten_table = load_table(rewritten_file, columns)
 
     # Flatten struct columns for comparison
     click.echo("Flattening struct columns...")
 
     # Compare tables and show full report
     issues = compare_tables(
-        datasets_table, rewritten_table, label1=datasets_file, label2=rewritten_file
+        datasets_table,
+        rewritten_table,
+        label1=datasets_file,
+        label2=rewritten_file,
+        columns=columns,
     )
 
     # Print final report
@@ -631,18 +974,15 @@ def main(datasets_file, rewritten_file, allowed_mismatch_columns):
                     # Fallback for other formats
                     msg += f"\n    - {sample}"
         print(msg)
+    allowed_columns = set(allowed_mismatch_columns.split(","))
     issues_leading_to_failure = [
-        issue
-        for issue in issues
-        if issue["column"] not in allowed_mismatch_columns.split(",")
+        issue for issue in issues if issue["column"] not in allowed_columns
     ]
     if len(issues_leading_to_failure) > 0:
         for issue in issues_leading_to_failure:
-            if issue["column"] in allowed_mismatch_columns.split(","):
-                continue
             print(f"\n✗ Comparison failed due to issue: {issue['message']}")
-        exit(1)
-    exit(0)
+        sys.exit(1)
+    sys.exit(0)
 
 
 if __name__ == "__main__":
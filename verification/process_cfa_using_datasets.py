@@ -2,32 +2,22 @@
 # Run this first
 # uv run --with-requirements=verification/requirements.in python verification/process_cfa_using_datasets.py
 from datasets import load_dataset_builder
-from utils import get_catalog
+from utils import add_catalog_columns, default_num_proc, get_catalog
 
-# Load the dataset descriptions from local copy of the data (cfa3 config)
-cfa = load_dataset_builder(
-    "data/MultimodalUniverse/v1/cfa", trust_remote_code=True, name="cfa3"
-)
-cfa.download_and_prepare()
 
-cfa_catalog = get_catalog(cfa)
+if __name__ == "__main__":
+    # Load the dataset descriptions from local copy of the data (cfa3 config)
+    cfa = load_dataset_builder(
+        "data/MultimodalUniverse/v1/cfa", trust_remote_code=True, name="cfa3"
+    )
+    cfa.download_and_prepare()
 
+    cfa_catalog = get_catalog(
+        cfa, keys=["object_id", "ra", "dec"], num_proc=default_num_proc()
+    )
 
-def match_cfa_catalog_object_ids(example, catalog):
+    cfa_train = cfa.as_dataset(split="train")
     # CFA object_id is returned as string from _generate_examples
-    example_obj_id = example["object_id"]
-    catalog_entry = catalog[catalog["object_id"] == example_obj_id]
-    assert len(catalog_entry) == 1, f"Expected 1 entry for {example_obj_id}, got {len(catalog_entry)}"
-    return {
-        **example,
-        "ra": catalog_entry["ra"][0],
-        "dec": catalog_entry["dec"][0],
-    }
-
-
-cfa_train = cfa.as_dataset(split="train")
-cfa_mapped = cfa_train.map(
-    lambda example: match_cfa_catalog_object_ids(example, cfa_catalog)
-)
-cfa_mapped.save_to_disk("data/MultimodalUniverse/v1/cfa_with_coordinates")
-print(f"Saved {len(cfa_mapped)} examples to data/MultimodalUniverse/v1/cfa_with_coordinates")
+    cfa_mapped = add_catalog_columns(cfa_train, cfa_catalog, ["ra", "dec"])
+    cfa_mapped.save_to_disk("data/MultimodalUniverse/v1/cfa_with_coordinates")
+    print(f"Saved {len(cfa_mapped)} examples to data/MultimodalUniverse/v1/cfa_with_coordinates")
@@ -2,31 +2,23 @@
 # Run this first
 # uv run --with-requirements=verification/requirements.in python verification/process_foundation_using_datasets.py
 from datasets import load_dataset_builder
-from utils import get_catalog
+from utils import add_catalog_columns, default_num_proc, get_catalog
 
-# Load the dataset descriptions from local copy of the data
-foundation = load_dataset_builder(
-    "data/MultimodalUniverse/v1/foundation", trust_remote_code=True
-)
-foundation.download_and_prepare()
 
-foundation_catalog = get_catalog(foundation)
+if __name__ == "__main__":
+    # Load the dataset descriptions from local copy of the data
+    foundation = load_dataset_builder(
+        "data/MultimodalUniverse/v1/foundation", trust_remote_code=True
+    )
+    foundation.download_and_prepare()
 
+    foundation_catalog = get_catalog(
+        foundation, keys=["object_id", "ra", "dec"], num_proc=default_num_proc()
+    )
 
-def match_foundation_catalog_object_ids(example, catalog):
+    foundation_train = foundation.as_dataset(split="train")
     # Foundation object_id is returned as string from _generate_examples
-    example_obj_id = example["object_id"]
-    catalog_entry = catalog[catalog["object_id"] == example_obj_id]
-    assert len(catalog_entry) == 1, f"Expected 1 entry for {example_obj_id}, got {len(catalog_entry)}"
-    return {
-        **example,
-        "ra": catalog_entry["ra"][0],
-        "dec": catalog_entry["dec"][0],
-    }
-
-
-foundation_train = foundation.as_dataset(split="train")
-foundation_mapped = foundation_train.map(
-    lambda example: match_foundation_catalog_object_ids(example, foundation_catalog)
-)
-foundation_mapped.save_to_disk("data/MultimodalUniverse/v1/foundation_with_coordinates")
+    foundation_mapped = add_catalog_columns(
+        foundation_train, foundation_catalog, ["ra", "dec"]
+    )
+    foundation_mapped.save_to_disk("data/MultimodalUniverse/v1/foundation_with_coordinates")
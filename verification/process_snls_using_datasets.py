@@ -2,29 +2,19 @@
 # Run this first
 # uv run --with-requirements=verification/requirements.in python verification/process_snls_using_datasets.py
 from datasets import load_dataset_builder
-from utils import get_catalog
+from utils import add_catalog_columns, default_num_proc, get_catalog
 
-# Load the dataset descriptions from local copy of the data
-snls = load_dataset_builder("data/MultimodalUniverse/v1/snls", trust_remote_code=True)
-snls.download_and_prepare()
 
-snls_catalog = get_catalog(snls)
+if __name__ == "__main__":
+    # Load the dataset descriptions from local copy of the data
+    snls = load_dataset_builder("data/MultimodalUniverse/v1/snls", trust_remote_code=True)
+    snls.download_and_prepare()
 
+    snls_catalog = get_catalog(
+        snls, keys=["object_id", "ra", "dec"], num_proc=default_num_proc()
+    )
 
-def match_snls_catalog_object_ids(example, catalog):
+    snls_train = snls.as_dataset(split="train")
     # SNLS object_id is returned as string from _generate_examples
-    example_obj_id = example["object_id"]
-    catalog_entry = catalog[catalog["object_id"] == example_obj_id]
-    assert len(catalog_entry) == 1, f"Expected 1 entry for {example_obj_id}, got {len(catalog_entry)}"
-    return {
-        **example,
-        "ra": catalog_entry["ra"][0],
-        "dec": catalog_entry["dec"][0],
-    }
-
-
-snls_train = snls.as_dataset(split="train")
-snls_mapped = snls_train.map(
-    lambda example: match_snls_catalog_object_ids(example, snls_catalog)
-)
-snls_mapped.save_to_disk("data/MultimodalUniverse/v1/snls_with_coordinates")
+    snls_mapped = add_catalog_columns(snls_train, snls_catalog, ["ra", "dec"])
+    snls_mapped.save_to_disk("data/MultimodalUniverse/v1/snls_with_coordinates")
@@ -3,28 +3,24 @@
 # uv pip install -r requirements.txt
 # ./download_tess_hsc.sh
 from datasets import load_dataset_builder, concatenate_datasets
-from utils import get_catalog
+from utils import add_catalog_columns, default_num_proc, get_catalog
 
-# Load the dataset descriptions from local copy of the data
-tess = load_dataset_builder("data/MultimodalUniverse/v1/tess", trust_remote_code=True)
-tess.download_and_prepare()
 
-tess_catalog = get_catalog(tess, keys=["object_id", "RA", "DEC"])
+def parse_tess_object_id(object_id):
+    return int(object_id.strip("b'"))
 
 
-def match_tess_catalog_object_ids(example, catalog):
-    example_obj_id = example["object_id"].strip("b'")
-    catalog_entry = catalog[catalog["object_id"] == int(example_obj_id)]
-    assert len(catalog_entry) == 1
-    return {
-        **example,
-        "RA": catalog_entry["RA"][0],
-        "DEC": catalog_entry["DEC"][0],
-    }
+if __name__ == "__main__":
+    # Load the dataset descriptions from local copy of the data
+    tess = load_dataset_builder("data/MultimodalUniverse/v1/tess", trust_remote_code=True)
+    tess.download_and_prepare()
 
+    tess_catalog = get_catalog(
+        tess, keys=["object_id", "RA", "DEC"], num_proc=default_num_proc()
+    )
 
-tess_train = tess.as_dataset(split="train")
-tess_mapped = tess_train.map(
-    lambda example: match_tess_catalog_object_ids(example, tess_catalog)
-)
-tess_mapped.save_to_disk("data/MultimodalUniverse/v1/tess_with_coordinates")
+    tess_train = tess.as_dataset(split="train")
+    tess_mapped = add_catalog_columns(
+        tess_train, tess_catalog, ["RA", "DEC"], parse_tess_object_id
+    )
+    tess_mapped.save_to_disk("data/MultimodalUniverse/v1/tess_with_coordinates")
@@ -1,24 +1,59 @@
 """Standalone utilities for verification scripts - compatible with numpy<2."""
+import os
 import numpy as np
 import h5py
-from astropy.table import Table, vstack
+from astropy.table import Table
 from typing import List
 from functools import partial
 from multiprocessing import Pool
 
+# The verification scripts run from verification/ without the mmu package installed,
+# so this keeps its own copy of the chunk cache settings of mmu/hdf5.py
+CHUNK_CACHE_BYTES = 64 * 1024 * 1024
+# HDF5 recommends about 100 hash table slots per chunk that fits in the cache
+CHUNK_CACHE_SLOTS_PER_CHUNK = 100
+
+
+def _open_dataset(h5_file: h5py.File, name: str) -> h5py.Dataset:
+    # Whole columns are read through several partial selections, so give each dataset a
+    # chunk cache large enough to keep its chunks decompressed while they are all read
+    dataset = h5_file[name]
+    if dataset.chunks is None:
+        return dataset
+    chunk_bytes = int(np.prod(dataset.chunks)) * dataset.dtype.itemsize
+    num_chunks = int(np.prod(np.ceil(np.divide(dataset.shape, dataset.chunks))))
+    # HDF5 shares the chunk cache of a dataset that is already open, close it first
+    del dataset
+    cached_chunks = max(1, min(num_chunks, CHUNK_CACHE_BYTES // chunk_bytes))
+    dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+    dapl.set_chunk_cache(
+        CHUNK_CACHE_SLOTS_PER_CHUNK * cached_chunks, CHUNK_CACHE_BYTES, 0.75
+    )
+    return h5py.Dataset(h5py.h5d.open(h5_file.id, name.encode(), dapl))
+
 
 def _file_to_catalog(filename: str, keys: List[str]):
     with h5py.File(filename, "r") as data:
         table_data = {}
         for k in keys:
-            value = data[k][()]  # Get the value
+            value = _open_dataset(data, k)[()]  # Get the value
             # Convert bytes dtype to unicode for astropy compatibility
             if hasattr(value, "dtype") and value.dtype.kind == "S":
                 # Wrap scalar in array and convert bytes to unicode
                 table_data[k] = np.atleast_1d(value).astype("U")
             else:
                 table_data[k] = np.atleast_1d(value)
-        return Table(table_data)
+        return table_data
+
+
+# verify.py shares the CPUs between the catalogs it verifies side by side through the
+# same variable as transform_scripts/runner.py, which cannot be imported from here
+WORKERS_ENV_VAR = "TRANSFORM_WORKERS"
+
+
+def default_num_proc() -> int:
+    """Number of processes to read a catalog with: the verify.py budget, or all CPUs."""
+    return int(os.environ.get(WORKERS_ENV_VAR, 0)) or os.cpu_count()
 
 
 def get_catalog(
@@ -34,6 +69,7 @@ def get_catalog(
         keys (List[str], optional): List of column names to include in the catalog.
         split (str, optional): The split of the dataset to retrieve the catalog from.
         num_proc (int, optional): Number of processes to use for parallel processing.
+            The calling script must then guard its code with if __name__ == "__main__".
 
     Returns:
         astropy.table.Table: The catalog of the parent sample.
@@ -42,13 +78,84 @@ def get_catalog(
         raise ValueError(
             f"At least one data file must be specified, but got data_files={dset.config.data_files}"
         )
+    filenames = dset.config.data_files[split]
+    if not filenames:
+        return Table(names=keys)
     catalogs = []
+    # h5py serializes all HDF5 calls behind a global lock, so files are read in processes
     if num_proc > 1:
-        with Pool(num_proc) as pool:
-            catalogs = pool.map(
-                partial(_file_to_catalog, keys=keys), dset.config.data_files[split]
-            )
+        with Pool(min(num_proc, len(filenames))) as pool:
+            catalogs = pool.map(partial(_file_to_catalog, keys=keys), filenames)
     else:
-        for filename in dset.config.data_files[split]:
+        for filename in filenames:
             catalogs.append(_file_to_catalog(filename, keys=keys))
-    return vstack(catalogs)
+    # one concatenation per column, instead of a Table per file and a vstack of them
+    return Table({k: np.concatenate([catalog[k] for catalog in catalogs]) for k in keys})
+
+
+def index_catalog(catalog: Table):
+    """Index the rows of a catalog by object_id.
+
+    Args:
+        catalog (astropy.table.Table): Catalog with an object_id column.
+
+    Returns:
+        tuple: (row_of_object_id, duplicated) where row_of_object_id maps each object_id
+        to its first row and duplicated is the set of object_ids found more than once.
+    """
+    row_of_object_id = {}
+    duplicated = set()
+    for row, object_id in enumerate(catalog["object_id"].tolist()):
+        if object_id in row_of_object_id:
+            duplicated.add(object_id)
+        row_of_object_id.setdefault(object_id, row)
+    return row_of_object_id, duplicated
+
+
+def add_catalog_columns(
+    dataset,
+    catalog: Table,
+    columns: List[str],
+    parse_object_id=None,
+    batch_size: int = 1000,
+    catalog_index=None,
+):
+    """Add catalog columns to the examples of a dataset, matched on object_id.
+
+    The catalog is indexed by object_id once, so each example is a dictionary lookup
+    instead of a scan over the whole catalog, and the columns are added in batches.
+
+    Args:
+        dataset (Dataset): The dataset to add the columns to.
+        catalog (astropy.table.Table): Catalog with an object_id column and the columns to add.
+        columns (List[str]): Names of the catalog columns to add.
+        parse_object_id (callable, optional): Converts an example object_id to the catalog's
+            object_id values (e.g. strips the b'' of stringified bytes).
+        batch_size (int, optional): Number of examples per batch.
+        catalog_index (tuple, optional): The index_catalog result of the catalog, to share
+            it between several datasets matched against the same catalog.
+
+    Returns:
+        Dataset: The dataset with the added columns.
+    """
+    if catalog_index is None:
+        catalog_index = index_catalog(catalog)
+    row_of_object_id, duplicated = catalog_index
+    values = {col: np.asarray(catalog[col]) for col in columns}
+
+    def add_columns(object_ids):
+        rows = []
+        for object_id in object_ids:
+            if parse_object_id is not None:
+                object_id = parse_object_id(object_id)
+            assert (
+                object_id in row_of_object_id and object_id not in duplicated
+            ), f"Expected 1 catalog entry for {object_id}"
+            rows.append(row_of_object_id[object_id])
+        return {col: values[col][rows] for col in columns}
+
+    # only object_id is handed to add_columns, the other (image, spectrum, ...) columns
+    # of the examples are carried over as Arrow data without going through Python
+    return dataset.map(
+        add_columns, batched=True, batch_size=batch_size, input_columns="object_id"
+    )
@@ -1,6 +1,17 @@
+import contextlib
+import os
+import runpy
 import subprocess
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import click
 
+from transform_scripts.runner import WORKERS_ENV_VAR
+from verification.compare import main as compare_main
+
 
 catalogs = [
     "sdss",
@@ -129,76 +140,212 @@ catalog_data = {
 }
 
 
-@click.command()
-@click.argument("catalog_name", type=click.Choice(catalogs))
-def run_single_catalog(catalog_name: str):
-    """Run verification pipeline for a catalog."""
+# Unbuffered child output keeps its order with our own messages in a shared log file, and
+# uv byte-compiles the step 1 environment once when it builds it, instead of every child
+# process compiling the datasets/astropy imports again on its first run
+STEP_ENV = {"PYTHONUNBUFFERED": "1", "UV_COMPILE_BYTECODE": "1"}
+
+
+def step_env() -> dict:
+    """The environment of a step, read when it starts so that it inherits the worker
+    budget each parallel job sets in os.environ."""
+    return {**os.environ, **STEP_ENV}
+
+
+def _echo(message, log=None, err=False):
+    """Echo to the console or to a catalog log file, flushing so that the output of
+    subsequent child processes writing to the same stream stays in order."""
+    click.echo(message, file=log, err=err)
+    (log or (sys.stderr if err else sys.stdout)).flush()
+
+
+def run_step(command: str, log=None) -> int:
+    """Run a shell command, streaming its output instead of buffering it in memory.
+
+    Without a log file the child inherits our stdout/stderr, otherwise both are written
+    to the log file.
+    """
+    if log is None:
+        return subprocess.run(command, shell=True, env=step_env()).returncode
+    return subprocess.run(
+        command, shell=True, stdout=log, stderr=subprocess.STDOUT, env=step_env()
+    ).returncode
+
+
+def run_in_process(func, log=None) -> int:
+    """Run a step in this interpreter, saving the start-up and import cost of a new
+    Python process. Returns an exit code like run_step."""
+    try:
+        with contextlib.ExitStack() as redirects:
+            if log is not None:
+                # warnings and tracebacks go to the catalog log too, not the shared stderr
+                redirects.enter_context(contextlib.redirect_stdout(log))
+                redirects.enter_context(contextlib.redirect_stderr(log))
+            func()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        return 1
+    except Exception:
+        traceback.print_exc(file=log)
+        return 1
+    finally:
+        if log is not None:
+            log.flush()
+    return 0
+
+
+def saved_dataset_exists(catalog_name: str) -> bool:
+    """Whether the datasets output of step 1 was already saved for a catalog."""
+    saved_dataset = catalog_data.get(catalog_name, {}).get("original-mmu")
+    return saved_dataset is not None and (Path(saved_dataset) / "state.json").is_file()
+
+
+def verify_catalog(catalog_name: str, log=None, reuse_datasets: bool = False) -> bool:
+    """Run verification pipeline for a catalog, returns True on success.
+
+    With reuse_datasets, the download and datasets steps are skipped if their saved
+    dataset already exists, e.g. when iterating on a transform script.
+    """
+    if reuse_datasets and saved_dataset_exists(catalog_name):
+        _echo(f"Steps 0-1: Reusing the saved {catalog_name} dataset", log)
+        return transform_and_compare(catalog_name, log)
+
     # Step 0: Download data + script file
-    click.echo(f"Step 0: Downloading data and script for {catalog_name}...")
+    _echo(f"Step 0: Downloading data and script for {catalog_name}...", log)
     download_command = f"./verification/download_{catalog_name}.sh"
-    result = subprocess.run(
-        download_command,
-        shell=True,
-        capture_output=True,
-        text=True,
-    )
-    click.echo(result.stdout)
-    if result.returncode != 0:
-        click.echo("Error in download step:", err=True)
-        click.echo(result.stderr, err=True)
-        exit(1)
-    # Step 1: Load via external script
-    click.echo(f"Step 1: Loading {catalog_name} via datasets...")
+    if run_step(download_command, log) != 0:
+        _echo("Error in download step", log, err=True)
+        return False
+
+    # Step 1: Load via external script, this needs its own environment (datasets==3.6, numpy<2)
+    _echo(f"Step 1: Loading {catalog_name} via datasets...", log)
     load_via_extern_script_command = f"uv run --with-requirements=verification/requirements.in python verification/process_{catalog_name}_using_datasets.py"
-    result = subprocess.run(
-        load_via_extern_script_command,
-        shell=True,
-        capture_output=True,
-        text=True,
-    )
-    click.echo(result.stdout)
-    if result.returncode != 0:
-        click.echo("Error in loading step:", err=True)
-        click.echo(result.stderr, err=True)
-        exit(1)
+    if run_step(load_via_extern_script_command, log) != 0:
+        _echo("Error in loading step", log, err=True)
+        return False
+
+    return transform_and_compare(catalog_name, log)
 
-    # Step 2: Transform to parquet
-    click.echo(f"\nStep 2: Transforming {catalog_name} to parquet...")
-    transform_to_parquet_command = (
-        f"python -m transform_scripts.transform_{catalog_name}_to_parquet"
-    )
-    result = subprocess.run(
-        transform_to_parquet_command,
-        shell=True,
-        capture_output=True,
-        text=True,
-    )
-    click.echo(result.stdout)
-    if result.returncode != 0:
-        click.echo("Error in transform step:", err=True)
-        click.echo(result.stderr, err=True)
-        exit(1)
+
+def transform_and_compare(catalog_name: str, log=None) -> bool:
+    """Run the transform and compare steps of the pipeline, returns True on success."""
+    # Step 2: Transform to parquet, in-process since it uses our own environment
+    _echo(f"\nStep 2: Transforming {catalog_name} to parquet...", log)
+    transform_module = f"transform_scripts.transform_{catalog_name}_to_parquet"
+    if (
+        run_in_process(
+            lambda: runpy.run_module(transform_module, run_name="__main__"), log
+        )
+        != 0
+    ):
+        _echo("Error in transform step", log, err=True)
+        return False
 
     # Step 3: Compare files
-    click.echo(f"\nStep 3: Comparing {catalog_name} files...")
-    compare_command = f"python verification/compare.py --datasets-file {catalog_data[catalog_name]['original-mmu']} --rewritten-file {catalog_data[catalog_name]['rewritten']}"
+    _echo(f"\nStep 3: Comparing {catalog_name} files...", log)
+    compare_args = [
+        "--datasets-file",
+        catalog_data[catalog_name]["original-mmu"],
+        "--rewritten-file",
+        catalog_data[catalog_name]["rewritten"],
+    ]
     if "allowed-mismatch-columns" in catalog_data[catalog_name]:
-        compare_command += f" --allowed-mismatch-columns {catalog_data[catalog_name]['allowed-mismatch-columns']}"
-    result = subprocess.run(
-        compare_command,
-        shell=True,
-        capture_output=True,
-        text=True,
-    )
-    click.echo(result.stdout)
-    if result.returncode != 0:
-        click.echo("Error in comparison step:", err=True)
-        click.echo(result.stderr, err=True)
-        exit(1)
+        compare_args += [
+            "--allowed-mismatch-columns",
+            catalog_data[catalog_name]["allowed-mismatch-columns"],
+        ]
+    if (
+        run_in_process(
+            lambda: compare_main.main(args=compare_args, standalone_mode=False), log
+        )
+        != 0
+    ):
+        _echo("Error in comparison step", log, err=True)
+        return False
+
+    _echo(f"\n✓ Verification complete for {catalog_name}", log)
+    return True
+
 
-    click.echo(f"\n✓ Verification complete for {catalog_name}")
-    return
+def _verify_catalog_to_log(
+    catalog_name: str, log_dir: str, reuse_datasets: bool, transform_workers: int
+) -> tuple[str, bool]:
+    # Share the CPUs between the catalogs verified side by side
+    os.environ[WORKERS_ENV_VAR] = str(transform_workers)
+    with open(Path(log_dir) / f"{catalog_name}.log", "w") as log:
+        return catalog_name, verify_catalog(catalog_name, log, reuse_datasets)
+
+
+def run_all_catalogs(
+    catalog_names: list[str], jobs: int, log_dir: str, reuse_datasets: bool = False
+) -> list[str]:
+    """Verify several catalogs concurrently, each writing to its own log file.
+
+    The catalogs have independent inputs and outputs and the steps are mostly I/O bound,
+    so they can run side by side. Returns the names of the catalogs that failed.
+    """
+    Path(log_dir).mkdir(parents=True, exist_ok=True)
+    failed = []
+    jobs = min(jobs, len(catalog_names))
+    transform_workers = max(1, os.cpu_count() // jobs)
+    # Unlike multiprocessing.Pool, these workers are not daemonic, so the in-process
+    # transform step can still start its own worker processes
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = list(
+            executor.map(
+                _verify_catalog_to_log,
+                catalog_names,
+                [log_dir] * len(catalog_names),
+                [reuse_datasets] * len(catalog_names),
+                [transform_workers] * len(catalog_names),
+            )
+        )
+    for catalog_name, success in results:
+        status = "✓" if success else "✗"
+        click.echo(f"{status} {catalog_name} (log: {Path(log_dir) / catalog_name}.log)")
+        if not success:
+            failed.append(catalog_name)
+    return failed
+
+
+@click.command()
+@click.argument("catalog_names", nargs=-1, required=True, type=click.Choice(catalogs))
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    show_default=True,
+    help="Number of catalogs to verify in parallel",
+)
+@click.option(
+    "--log-dir",
+    default="logs",
+    show_default=True,
+    help="Directory for per-catalog logs when verifying more than one catalog",
+)
+@click.option(
+    "--reuse-datasets",
+    is_flag=True,
+    help="Skip the download and datasets steps of catalogs whose saved dataset exists",
+)
+def main(
+    catalog_names: tuple[str, ...], jobs: int, log_dir: str, reuse_datasets: bool
+):
+    """Run verification pipeline for one or more catalogs.
+
+    A single catalog streams its output to the console, several catalogs are verified
+    with up to JOBS worker processes and write their output to LOG_DIR/<catalog>.log.
+    """
+    if len(catalog_names) == 1:
+        if not verify_catalog(catalog_names[0], reuse_datasets=reuse_datasets):
+            exit(1)
+        return
+    failed = run_all_catalogs(list(catalog_names), jobs, log_dir, reuse_datasets)
+    if failed:
+        click.echo(f"Verification failed for: {', '.join(failed)}", err=True)
+        exit(1)
 
 
 if __name__ == "__main__":
-    run_single_catalog()
+    main()